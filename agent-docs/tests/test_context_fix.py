@@ -97,7 +97,7 @@ async def test_iap_manager():
         print("✅ Successfully created IAP Manager with robust context access")
         
         # Test a simple IAP operation (create template)
-        result = await iap_manager.create_iap_template(
+        result = iap_manager.create_iap_template(
             student_name="Test Student",
             student_id="TEST123",
             degree_emphasis="Psychology and Data Science",
@@ -40,7 +40,7 @@ async def test_iap_tools():
     # Test 1: Create IAP Template
     print("\n📝 Test 1: Creating IAP Template...")
     try:
-        result = await iap_manager.create_iap_template(
+        result = iap_manager.create_iap_template(
             student_name="Sarah Johnson",
             student_id="SJ2024001", 
             degree_emphasis="Psychology and Communication",
@@ -73,7 +73,7 @@ async def test_iap_tools():
     # Test 3: Generate IAP Suggestions
     print("\n📝 Test 3: Generating IAP Suggestions...")
     try:
-        result = await iap_manager.generate_iap_suggestions(
+        result = iap_manager.generate_iap_suggestions(
             degree_emphasis="Psychology and Communication",
             section="program_goals",
             context={"student_interests": "mental health, community outreach"}
@@ -105,7 +105,7 @@ async def test_iap_tools():
             }
         }
         
-        result = await iap_manager.validate_iap_requirements(sample_iap)
+        result = iap_manager.validate_iap_requirements(sample_iap)
         print("✅ IAP Validation completed successfully")
         print(f"   Result: {json.dumps(result, indent=2)}")
     except Exception as e:
@@ -115,7 +115,7 @@ async def test_iap_tools():
     # Test 5: Conduct Market Research
     print("\n📝 Test 5: Conducting Market Research...")
     try:
-        result = await iap_manager.conduct_market_research(
+        result = iap_manager.conduct_market_research(
             degree_emphasis="Psychology and Communication",
             geographic_focus="Utah"
         )
@@ -58,7 +58,7 @@ async def comprehensive_iap_test():
     
     for student in students:
         try:
-            result = await iap_manager.create_iap_template(
+            result = iap_manager.create_iap_template(
                 student_name=student["name"],
                 student_id=student["id"],
                 degree_emphasis=student["emphasis"],
@@ -113,7 +113,7 @@ async def comprehensive_iap_test():
     
     for suggestion in suggestions:
         try:
-            result = await iap_manager.generate_iap_suggestions(
+            result = iap_manager.generate_iap_suggestions(
                 degree_emphasis=suggestion["emphasis"],
                 section=suggestion["section"]
             )
@@ -143,7 +143,7 @@ async def comprehensive_iap_test():
     
     for iap in sample_iaps:
         try:
-            result = await iap_manager.validate_iap_requirements(iap)
+            result = iap_manager.validate_iap_requirements(iap)
             print(f"   ✅ Validated IAP for {iap['student_id']}")
             test_results.append(("validate_iap", iap["student_id"], True))
         except Exception as e:
@@ -160,7 +160,7 @@ async def comprehensive_iap_test():
     
     for emphasis in emphases:
         try:
-            result = await iap_manager.conduct_market_research(
+            result = iap_manager.conduct_market_research(
                 degree_emphasis=emphasis,
                 geographic_focus="Utah"
             )
@@ -174,7 +174,7 @@ async def comprehensive_iap_test():
     # Test 6: General Education Tracking
     print("\n📝 Test 6: General Education Tracking...")
     try:
-        result = await iap_manager.track_general_education(
+        result = iap_manager.track_general_education(
             student_id="SJ2024001",
             course_list=["ENGL 1010", "MATH 1050", "BIOL 1010", "HIST 1700", "PHIL 1000"]
         )
@@ -187,7 +187,7 @@ async def comprehensive_iap_test():
     # Test 7: Concentration Area Validation
     print("\n📝 Test 7: Concentration Area Validation...")
     try:
-        result = await iap_manager.validate_concentration_areas(
+        result = iap_manager.validate_concentration_areas(
             student_id="SJ2024001",
             concentration_areas=["Psychology", "Communication", "Social Work"],
             course_mappings={
@@ -102,6 +102,9 @@ class AcademicGraphBuilder:
         # Step 4: Create relationships
         await self._create_relationships(academic_data)
         
+        # Step 5: Give courses loaded without a credit value the default
+        await self._normalize_course_credits()
+        
         print("✅ Academic Knowledge Graph built successfully!")
         return academic_data
     
@@ -122,10 +125,13 @@ class AcademicGraphBuilder:
             "CREATE CONSTRAINT course_code IF NOT EXISTS FOR (course:Course) REQUIRE course.code IS UNIQUE",
             "CREATE CONSTRAINT requirement_name IF NOT EXISTS FOR (r:Requirement) REQUIRE r.name IS UNIQUE",
             
-            # Indexes for performance
+            # Indexes for performance; the planner's lookups anchor on Course.code or filter on level/department
             "CREATE INDEX course_prefix IF NOT EXISTS FOR (course:Course) ON (course.prefix)",
             "CREATE INDEX course_number IF NOT EXISTS FOR (course:Course) ON (course.number)",
             "CREATE INDEX course_level IF NOT EXISTS FOR (course:Course) ON (course.level)",
+            "CREATE INDEX course_department IF NOT EXISTS FOR (course:Course) ON (course.department)",
+            "CREATE INDEX course_level_department IF NOT EXISTS FOR (course:Course) ON (course.level, course.department)",
+            "CREATE INDEX course_level_credits IF NOT EXISTS FOR (course:Course) ON (course.level, course.credits)",
             "CREATE INDEX program_type IF NOT EXISTS FOR (p:Program) ON (p.type)",
             "CREATE INDEX program_level IF NOT EXISTS FOR (p:Program) ON (p.level)",
         ]
@@ -133,7 +139,8 @@ class AcademicGraphBuilder:
         with self.neo4j_driver.session() as session:
             for query in schema_queries:
                 try:
-                    session.run(query)
+                    # Consume each result so a failure is reported against its own statement
+                    session.run(query).consume()
                     print(f"   ✅ {query.split()[1]} created")
                 except Exception as e:
                     if "already exists" not in str(e).lower():
@@ -503,7 +510,7 @@ class AcademicGraphBuilder:
                     "prefix": course_info.prefix,
                     "number": course_info.number,
                     "title": course_info.title,
-                    "credits": course_info.credits,
+                    "credits": course_info.credits or 3,  # Planner reads rely on credits being set
                     "level": course_info.level,
                     "description": course_info.description,
                     "prerequisites_text": ", ".join(course_info.prerequisites),
@@ -634,6 +641,23 @@ class AcademicGraphBuilder:
             print(f"❌ Error populating Supabase tables: {e}")
             # Continue with Neo4j population even if Supabase fails
     
+    async def _normalize_course_credits(self):
+        """Set the 3-credit default on Course nodes with no credit value, including ones loaded by other tools"""
+        if not self.neo4j_driver:
+            return
+        
+        with self.neo4j_driver.session() as session:
+            try:
+                result = session.run(
+                    "MATCH (course:Course) WHERE course.credits IS NULL OR course.credits = 0 "
+                    "SET course.credits = 3 RETURN count(course) as updated"
+                )
+                updated = result.single()["updated"]
+                if updated:
+                    print(f"   ✅ Defaulted credits on {updated} courses")
+            except Exception as e:
+                print(f"   ⚠️ Could not default course credits: {e}")
+    
     async def _create_relationships(self, academic_data: Dict):
         """Create relationships between academic entities"""
         print("🔗 Creating relationships between academic entities...")
@@ -8,22 +8,28 @@ Also includes AI hallucination detection and repository parsing tools using Neo4
 from mcp.server.fastmcp import FastMCP, Context
 from sentence_transformers import CrossEncoder
 from contextlib import asynccontextmanager
+from collections import OrderedDict
 from collections.abc import AsyncIterator
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urlparse, urldefrag
 from xml.etree import ElementTree
 from dotenv import load_dotenv
 from supabase import Client
 from pathlib import Path
 import requests
+import uvicorn
 import asyncio
 import json
+import orjson
 import os
 import re
 import concurrent.futures
+import functools
+import inspect
 import sys
 from datetime import datetime
+from itertools import islice
 
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode, MemoryAdaptiveDispatcher
 
@@ -44,7 +50,7 @@ from utils import (
 )
 
 # Import IAP tools
-from iap_tools import IAPManager
+from iap_tools import IAPManager, extract_course_codes
 
 # Import knowledge graph modules
 from knowledge_graph_validator import KnowledgeGraphValidator
@@ -53,7 +59,7 @@ from ai_script_analyzer import AIScriptAnalyzer
 from hallucination_reporter import HallucinationReporter
 
 # Import graph-enhanced academic planning tools
-from graph_enhanced_tools import GraphEnhancedAcademicPlanner
+from graph_enhanced_tools import GraphEnhancedAcademicPlanner, PrerequisitePath, close_driver
 from academic_graph_builder import AcademicGraphBuilder
 
 # Load environment variables from the project root .env file
@@ -63,6 +69,15 @@ dotenv_path = project_root / '.env'
 # Force override of existing environment variables
 load_dotenv(dotenv_path, override=True)
 
+def _to_json(result: Any, indent: bool = True) -> str:
+    """
+    Serialize a tool result to a JSON string using orjson, indented unless indent is False.
+    FastMCP only passes str results through as text content (bytes would be re-encoded
+    as a JSON string), so the decode here is the one conversion the response needs.
+    """
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(result, option=option).decode()
+
 # Helper functions for Neo4j validation and error handling
 def validate_neo4j_connection() -> bool:
     """Check if Neo4j environment variables are configured."""
@@ -129,6 +144,7 @@ class Crawl4AIContext:
     reranking_model: Optional[CrossEncoder] = None
     knowledge_validator: Optional[Any] = None  # KnowledgeGraphValidator when available
     repo_extractor: Optional[Any] = None       # DirectNeo4jExtractor when available
+    iap_manager: Optional[IAPManager] = None   # Created on first IAP tool call
 
 @asynccontextmanager
 async def crawl4ai_lifespan(server: FastMCP) -> AsyncIterator[Crawl4AIContext]:
@@ -198,17 +214,27 @@ async def crawl4ai_lifespan(server: FastMCP) -> AsyncIterator[Crawl4AIContext]:
     else:
         print("Knowledge graph functionality disabled - set USE_KNOWLEDGE_GRAPH=true to enable")
     
+    context = Crawl4AIContext(
+        crawler=crawler,
+        supabase_client=supabase_client,
+        reranking_model=reranking_model,
+        knowledge_validator=knowledge_validator,
+        repo_extractor=repo_extractor
+    )
     try:
-        yield Crawl4AIContext(
-            crawler=crawler,
-            supabase_client=supabase_client,
-            reranking_model=reranking_model,
-            knowledge_validator=knowledge_validator,
-            repo_extractor=repo_extractor
-        )
+        yield context
     finally:
         # Clean up all components
         await crawler.__aexit__(None, None, None)
+        if context.iap_manager:
+            try:
+                await context.iap_manager.flush()
+            except Exception as e:
+                print(f"Error flushing IAP updates: {e}")
+        try:
+            await _close_planner()
+        except Exception as e:
+            print(f"Error closing academic planner: {e}")
         if knowledge_validator:
             try:
                 await knowledge_validator.close()
@@ -597,6 +623,23 @@ def get_supabase_from_context(ctx: Context):
     except Exception as e:
         raise Exception(f"Unable to access Supabase client from context. Tried multiple approaches. Last error: {str(e)}")
 
+# Shared manager for contexts without a lifespan context; IAPManager makes no database calls
+_standalone_iap_manager = IAPManager()
+
+def get_iap_manager_from_context(ctx: Context) -> IAPManager:
+    """
+    Return the IAPManager stored on the lifespan context, creating it on first use.
+    Falls back to a shared client-less manager when no lifespan context is available,
+    rather than building a new synchronous Supabase client on the event loop.
+    """
+    lifespan_context = getattr(getattr(ctx, 'request_context', None), 'lifespan_context', None)
+    if lifespan_context is None:
+        return _standalone_iap_manager
+    iap_manager = getattr(lifespan_context, 'iap_manager', None)
+    if iap_manager is None:
+        iap_manager = IAPManager(getattr(lifespan_context, 'supabase_client', None))
+        lifespan_context.iap_manager = iap_manager
+    return iap_manager
 
 @mcp.tool()
 async def debug_context_structure(ctx: Context) -> str:
@@ -1725,13 +1768,14 @@ async def check_prerequisites(ctx: Context, course_code: str, source_id: str = N
         # Extract prerequisite information
         prerequisites_found = []
         course_description = ""
+        normalized_code = course_code.upper()
         
         import re
         for result in prereq_results:
             content = result.get("content", "")
             
             # Store course description from first result
-            if not course_description and course_code.upper() in content.upper():
+            if not course_description and normalized_code in content.upper():
                 course_description = content[:300]
             
             # Look for prerequisite patterns
@@ -2694,6 +2738,89 @@ async def crawl_recursive_internal_links(crawler: AsyncWebCrawler, start_urls: L
 
     return results_all
 
+# Static guidance returned by the academic knowledge graph and planning tools
+_KNOWLEDGE_GRAPH_CAPABILITIES = (
+    "Graph-based prerequisite chain analysis",
+    "Cross-disciplinary course discovery",
+    "Program requirement validation",
+    "Academic pathway planning",
+    "Relationship-based course recommendations"
+)
+
+_KNOWLEDGE_GRAPH_NEXT_STEPS = (
+    "Use query_knowledge_graph tool to explore academic entities",
+    "Test graph-enhanced academic planning queries",
+    "Validate prerequisite chains and program requirements"
+)
+
+_KNOWLEDGE_GRAPH_TROUBLESHOOTING = (
+    "Check Neo4j connection (NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)",
+    "Ensure crawled academic content exists in Supabase",
+    "Verify academic content parsing patterns",
+    "Check for sufficient academic data in catalog.utahtech.edu source"
+)
+
+_SUPABASE_BACKUP_RECOMMENDATIONS = (
+    "Verify data integrity with sample queries",
+    "Check for any missing prerequisite relationships",
+    "Test academic search tools with populated data",
+    "Consider running build_academic_knowledge_graph for Neo4j population"
+)
+
+_SUPABASE_DRY_RUN_RECOMMENDATIONS = (
+    "Run without --dry-run flag to actually insert data",
+    "Consider using --clear flag if you want to replace existing data",
+    "Adjust --batch-size if needed for performance"
+)
+
+_SUPABASE_TROUBLESHOOTING = (
+    "Check Supabase connection (SUPABASE_URL, SUPABASE_SERVICE_KEY)",
+    "Ensure academic tables exist (run SQL migration first)",
+    "Verify crawled academic content exists in database",
+    "Check for data constraint violations (name lengths, etc.)",
+    "Try with smaller batch_size or dry_run mode first"
+)
+
+_NO_PREREQUISITE_CHAIN_RECOMMENDATIONS = (
+    "Verify the course code is correct",
+    "Check if the course exists in the catalog",
+    "This course may be suitable for early enrollment"
+)
+
+_VALID_SEQUENCE_RECOMMENDATIONS = (
+    "✅ Course sequence is valid - no prerequisite violations detected",
+    "Consider course scheduling and availability when planning",
+    "Verify credit hour limits per semester"
+)
+
+_INVALID_SEQUENCE_RECOMMENDATIONS = (
+    "❌ Prerequisite violations detected - sequence needs adjustment",
+    "Review prerequisite requirements for flagged courses",
+    "Consider reordering courses to satisfy prerequisites"
+)
+
+_DEGREE_PROGRESS_NEXT_STEPS = (
+    "Review remaining course list for scheduling",
+    "Check course prerequisites and availability",
+    "Consider course load and semester planning",
+    "Consult with academic advisor for final validation"
+)
+
+_NO_ALTERNATIVE_COURSE_SUGGESTIONS = (
+    "Try expanding search to other departments (set same_department=False)",
+    "Check if the course code is correct",
+    "Consider courses with similar content or level",
+    "Consult with academic advisor for manual alternatives"
+)
+
+_ALTERNATIVE_COURSE_RECOMMENDATIONS = (
+    "Compare course descriptions and learning outcomes",
+    "Verify prerequisites for alternative courses",
+    "Check course scheduling and availability",
+    "Confirm alternatives meet degree requirements",
+    "Consult with academic advisor before substituting"
+)
+
 @mcp.tool()
 async def build_academic_knowledge_graph(ctx: Context) -> str:
     """
@@ -2725,6 +2852,15 @@ async def build_academic_knowledge_graph(ctx: Context) -> str:
             # Build the complete academic graph
             academic_data = await builder.build_academic_graph()
             
+            # Recompute the stored ancestor sets for the new prerequisite edges. The graph is
+            # built either way, so a failed refresh is reported as a warning, not a failure
+            warning = None
+            try:
+                planner = await _get_planner()
+                await planner.refresh_materialized_paths()
+            except Exception as e:
+                warning = f"Prerequisite paths were not refreshed; rebuild to update them: {format_neo4j_error(e)}"
+            
             # Generate summary statistics
             stats = {
                 "departments": len(academic_data.get("departments", {})),
@@ -2758,39 +2894,109 @@ async def build_academic_knowledge_graph(ctx: Context) -> str:
                     "programs": sample_programs,
                     "departments": sample_departments
                 },
-                "capabilities_enabled": [
-                    "Graph-based prerequisite chain analysis",
-                    "Cross-disciplinary course discovery",
-                    "Program requirement validation",
-                    "Academic pathway planning",
-                    "Relationship-based course recommendations"
-                ],
-                "next_steps": [
-                    "Use query_knowledge_graph tool to explore academic entities",
-                    "Test graph-enhanced academic planning queries",
-                    "Validate prerequisite chains and program requirements"
-                ]
+                "capabilities_enabled": _KNOWLEDGE_GRAPH_CAPABILITIES,
+                "next_steps": _KNOWLEDGE_GRAPH_NEXT_STEPS
             }
+            if warning:
+                result["warning"] = warning
             
         finally:
             # Always close the builder connection
             builder.close()
+            # Even a failed or partial build may have changed the graph, so drop cached reads
+            _prereq_chain_cache.clear()
+            if _planner is not None:
+                _planner.invalidate_cache()
         
-        return json.dumps(result, indent=2)
+        return _to_json(result)
         
     except Exception as e:
         error_result = {
             "success": False,
             "error": str(e),
             "message": "Failed to build academic knowledge graph",
-            "troubleshooting": [
-                "Check Neo4j connection (NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)",
-                "Ensure crawled academic content exists in Supabase",
-                "Verify academic content parsing patterns",
-                "Check for sufficient academic data in catalog.utahtech.edu source"
-            ]
+            "troubleshooting": _KNOWLEDGE_GRAPH_TROUBLESHOOTING
         }
-        return json.dumps(error_result, indent=2)
+        return _to_json(error_result, indent=False)
+
+@dataclass(slots=True)
+class _DepartmentRow:
+    """Row destined for the academic_departments table."""
+    prefix: str
+    name: str
+    description: Optional[str]
+
+@dataclass(slots=True)
+class _CourseRow:
+    """Row destined for the academic_courses table."""
+    course_code: str
+    title: str
+    description: Optional[str]
+    credits: int
+    department_prefix: str
+    prerequisites: Optional[str]
+
+@dataclass(slots=True)
+class _ProgramRow:
+    """Row destined for the academic_programs table."""
+    program_code: str
+    program_name: str
+    degree_type: str
+    department_prefix: str
+    description: Optional[str]
+
+def _truncate(value: Optional[str], limit: int) -> Optional[str]:
+    """Trim value to limit characters, returning the original string when it already fits."""
+    return value[:limit] if value and len(value) > limit else value
+
+def _preview(text: str, limit: int = 200) -> str:
+    """Return text unchanged when it fits in limit characters, else its first limit characters plus an ellipsis."""
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+def _build_department_record(dept_prefix: str, dept_data: Any) -> _DepartmentRow:
+    """Build an academic_departments row, truncating fields to the column limits."""
+    return _DepartmentRow(
+        prefix=dept_prefix,
+        name=_truncate(dept_data.name, 100),
+        description=_truncate(dept_data.description, 500) or None
+    )
+
+def _build_course_record(course_code: str, course_data: Any) -> _CourseRow:
+    """Build an academic_courses row, truncating fields to the column limits."""
+    # Extract department prefix
+    dept_prefix = course_code.split()[0] if ' ' in course_code else course_code[:4]
+    prerequisites = course_data.prerequisites
+    
+    return _CourseRow(
+        course_code=course_code,
+        title=_truncate(course_data.title, 200) or course_code,
+        description=_truncate(course_data.description, 1000) or None,
+        credits=course_data.credits,
+        department_prefix=dept_prefix,
+        prerequisites=', '.join(prerequisites) if prerequisites else None
+    )
+
+def _build_program_record(program_code: str, program_data: Any) -> _ProgramRow:
+    """Build an academic_programs row, truncating fields to the column limits."""
+    return _ProgramRow(
+        program_code=program_code,
+        program_name=_truncate(program_data.name, 150),
+        degree_type=program_data.type,
+        department_prefix=program_data.department,
+        description=_truncate(program_data.description, 1000) or None
+    )
+
+def _upsert_in_batches(supabase: Client, table: str, rows: List[Any], batch_size: int) -> int:
+    """Upsert rows into a Supabase table batch_size rows at a time and return the row count sent.
+    
+    Rows are held as slotted dataclasses and only converted to dicts one batch at a time.
+    """
+    inserted = 0
+    remaining = iter(rows)
+    while batch := list(islice(remaining, max(batch_size, 1))):
+        supabase.table(table).upsert([asdict(row) for row in batch]).execute()
+        inserted += len(batch)
+    return inserted
 
 @mcp.tool()
 async def populate_supabase_backup(ctx: Context, clear_existing: bool = False, batch_size: int = 100, dry_run: bool = False) -> str:
@@ -2881,105 +3087,49 @@ async def populate_supabase_backup(ctx: Context, clear_existing: bool = False, b
                     print(f"⚠️ Warning: Could not fetch existing records: {e}")
             
             # Process departments
-            departments_to_insert = []
-            for dept_prefix, dept_data in academic_data.get('departments', {}).items():
-                stats['departments_processed'] += 1
-                
-                if dept_prefix in existing_departments:
-                    stats['duplicates_skipped'] += 1
-                    continue
-                
-                # Truncate name if too long for database constraint
-                dept_name = dept_data.name[:100] if len(dept_data.name) > 100 else dept_data.name
-                
-                dept_record = {
-                    'prefix': dept_prefix,
-                    'name': dept_name,
-                    'description': dept_data.description[:500] if dept_data.description else None
-                }
-                departments_to_insert.append(dept_record)
-                
-                if len(departments_to_insert) >= batch_size:
-                    if not dry_run:
-                        result = supabase.table('academic_departments').upsert(departments_to_insert).execute()
-                        stats['departments_inserted'] += len(departments_to_insert)
-                    departments_to_insert = []
-            
-            # Insert remaining departments
-            if departments_to_insert and not dry_run:
-                result = supabase.table('academic_departments').upsert(departments_to_insert).execute()
-                stats['departments_inserted'] += len(departments_to_insert)
-            elif dry_run:
+            departments = academic_data.get('departments', {})
+            departments_to_insert = [
+                _build_department_record(dept_prefix, dept_data)
+                for dept_prefix, dept_data in departments.items()
+                if dept_prefix not in existing_departments
+            ]
+            stats['departments_processed'] = len(departments)
+            stats['duplicates_skipped'] += len(departments) - len(departments_to_insert)
+            
+            if dry_run:
                 stats['departments_inserted'] = len(departments_to_insert)
+            else:
+                stats['departments_inserted'] = _upsert_in_batches(supabase, 'academic_departments', departments_to_insert, batch_size)
             
             # Process courses
-            courses_to_insert = []
-            for course_code, course_data in academic_data.get('courses', {}).items():
-                stats['courses_processed'] += 1
-                
-                if course_code in existing_courses:
-                    stats['duplicates_skipped'] += 1
-                    continue
-                
-                # Extract department prefix
-                dept_prefix = course_code.split()[0] if ' ' in course_code else course_code[:4]
-                
-                course_record = {
-                    'course_code': course_code,
-                    'title': course_data.title[:200] if course_data.title else course_code,
-                    'description': course_data.description[:1000] if course_data.description else None,
-                    'credits': course_data.credits,
-                    'department_prefix': dept_prefix,
-                    'prerequisites': ', '.join(course_data.prerequisites) if course_data.prerequisites else None
-                }
-                courses_to_insert.append(course_record)
-                
-                if len(courses_to_insert) >= batch_size:
-                    if not dry_run:
-                        result = supabase.table('academic_courses').upsert(courses_to_insert).execute()
-                        stats['courses_inserted'] += len(courses_to_insert)
-                    courses_to_insert = []
-            
-            # Insert remaining courses
-            if courses_to_insert and not dry_run:
-                result = supabase.table('academic_courses').upsert(courses_to_insert).execute()
-                stats['courses_inserted'] += len(courses_to_insert)
-            elif dry_run:
+            courses = academic_data.get('courses', {})
+            courses_to_insert = [
+                _build_course_record(course_code, course_data)
+                for course_code, course_data in courses.items()
+                if course_code not in existing_courses
+            ]
+            stats['courses_processed'] = len(courses)
+            stats['duplicates_skipped'] += len(courses) - len(courses_to_insert)
+            
+            if dry_run:
                 stats['courses_inserted'] = len(courses_to_insert)
+            else:
+                stats['courses_inserted'] = _upsert_in_batches(supabase, 'academic_courses', courses_to_insert, batch_size)
             
             # Process programs
-            programs_to_insert = []
-            for program_code, program_data in academic_data.get('programs', {}).items():
-                stats['programs_processed'] += 1
-                
-                if program_code in existing_programs:
-                    stats['duplicates_skipped'] += 1
-                    continue
-                
-                # Truncate name if too long
-                program_name = program_data.name[:150] if len(program_data.name) > 150 else program_data.name
-                
-                program_record = {
-                    'program_code': program_code,
-                    'program_name': program_name,
-                    'degree_type': program_data.type,
-                    'department_prefix': program_data.department,
-                    'description': program_data.description[:1000] if program_data.description else None
-                }
-                programs_to_insert.append(program_record)
-                
-                if len(programs_to_insert) >= batch_size:
-                    if not dry_run:
-                        result = supabase.table('academic_programs').upsert(programs_to_insert).execute()
-                        stats['programs_inserted'] += len(programs_to_insert)
-                    programs_to_insert = []
-            
-            # Insert remaining programs
-            if programs_to_insert and not dry_run:
-                result = supabase.table('academic_programs').upsert(programs_to_insert).execute()
-                stats['programs_inserted'] += len(programs_to_insert)
-            elif dry_run:
+            programs = academic_data.get('programs', {})
+            programs_to_insert = [
+                _build_program_record(program_code, program_data)
+                for program_code, program_data in programs.items()
+                if program_code not in existing_programs
+            ]
+            stats['programs_processed'] = len(programs)
+            stats['duplicates_skipped'] += len(programs) - len(programs_to_insert)
+            
+            if dry_run:
                 stats['programs_inserted'] = len(programs_to_insert)
+            else:
+                stats['programs_inserted'] = _upsert_in_batches(supabase, 'academic_programs', programs_to_insert, batch_size)
             
         finally:
             # Always close the builder connection
@@ -3012,34 +3162,77 @@ async def populate_supabase_backup(ctx: Context, clear_existing: bool = False, b
                 "batch_size": batch_size,
                 "errors": stats['errors']
             },
-            "recommendations": [
-                "Verify data integrity with sample queries",
-                "Check for any missing prerequisite relationships",
-                "Test academic search tools with populated data",
-                "Consider running build_academic_knowledge_graph for Neo4j population"
-            ] if not dry_run else [
-                "Run without --dry-run flag to actually insert data",
-                "Consider using --clear flag if you want to replace existing data",
-                "Adjust --batch-size if needed for performance"
-            ]
+            "recommendations": _SUPABASE_DRY_RUN_RECOMMENDATIONS if dry_run else _SUPABASE_BACKUP_RECOMMENDATIONS
         }
         
-        return json.dumps(result, indent=2)
+        return _to_json(result)
         
     except Exception as e:
         error_result = {
             "success": False,
             "error": str(e),
             "message": "Failed to populate Supabase tables with backup tool",
-            "troubleshooting": [
-                "Check Supabase connection (SUPABASE_URL, SUPABASE_SERVICE_KEY)",
-                "Ensure academic tables exist (run SQL migration first)",
-                "Verify crawled academic content exists in database",
-                "Check for data constraint violations (name lengths, etc.)",
-                "Try with smaller batch_size or dry_run mode first"
-            ]
+            "troubleshooting": _SUPABASE_TROUBLESHOOTING
         }
-        return json.dumps(error_result, indent=2)
+        return _to_json(error_result, indent=False)
+
+# Shared troubleshooting hints for graph planning tool failures
+_GRAPH_TOOL_TROUBLESHOOTING = (
+    "Verify Neo4j connection is working",
+    "Check if academic knowledge graph is populated",
+    "Ensure course codes are formatted correctly (e.g., 'CS 1400')"
+)
+
+def _graph_error_json(error: str, **context: Any) -> str:
+    """Serialize a graph planning tool failure as compact JSON with troubleshooting hints."""
+    return _to_json({"error": error, **context, "troubleshooting": _GRAPH_TOOL_TROUBLESHOOTING}, indent=False)
+
+# Commas plus any surrounding whitespace separate entries in course list arguments
+_COURSE_LIST_SEPARATOR = re.compile(r'\s*,\s*')
+
+def _parse_course_list(course_list: str) -> List[str]:
+    """Split a comma-separated course list into upper-cased course codes."""
+    return [course for course in _COURSE_LIST_SEPARATOR.split(course_list.strip().upper()) if course]
+
+# Shared academic planner; its Neo4j driver pools connections across tool calls
+_planner: Optional[GraphEnhancedAcademicPlanner] = None
+_planner_lock = asyncio.Lock()
+
+async def _get_planner() -> GraphEnhancedAcademicPlanner:
+    """Return the shared academic planner, creating it on first use."""
+    global _planner
+    if _planner is None:
+        async with _planner_lock:
+            if _planner is None:
+                _planner = GraphEnhancedAcademicPlanner()
+    return _planner
+
+async def _close_planner() -> None:
+    """Release the shared academic planner and close the process-wide Neo4j driver."""
+    global _planner
+    if _planner is not None:
+        await _planner.close()
+        _planner = None
+    await close_driver()
+
+# Prerequisite chains only change when the knowledge graph is rebuilt, so they are
+# memoized per (course_code, max_depth) and cleared by build_academic_knowledge_graph
+_PREREQ_CHAIN_CACHE_SIZE = 512
+_prereq_chain_cache: OrderedDict[Tuple[str, int], List[PrerequisitePath]] = OrderedDict()
+
+async def _get_cached_prerequisite_chain(planner: GraphEnhancedAcademicPlanner, course_code: str, max_depth: int) -> List[PrerequisitePath]:
+    """Return prerequisite chains for a course, serving repeat lookups from an LRU cache."""
+    key = (course_code.strip().upper(), max_depth)
+    chains = _prereq_chain_cache.get(key)
+    if chains is not None:
+        _prereq_chain_cache.move_to_end(key)
+        return chains
+    
+    chains = await planner.get_prerequisite_chain(key[0], max_depth)
+    _prereq_chain_cache[key] = chains
+    if len(_prereq_chain_cache) > _PREREQ_CHAIN_CACHE_SIZE:
+        _prereq_chain_cache.popitem(last=False)
+    return chains
 
 @mcp.tool()
 async def get_prerequisite_chain(ctx: Context, course_code: str, max_depth: int = 10) -> str:
@@ -3058,26 +3251,34 @@ async def get_prerequisite_chain(ctx: Context, course_code: str, max_depth: int
         JSON string with prerequisite chain analysis and pathway recommendations
     """
     try:
-        planner = GraphEnhancedAcademicPlanner()
+        if not course_code.strip():
+            return _to_json({
+                "error": "No course code provided",
+                "message": "Please provide a course code (e.g., 'CS 3150')"
+            }, indent=False)
+        
+        planner = await _get_planner()
         
         # Get prerequisite chains
-        chains = await planner.get_prerequisite_chain(course_code, max_depth)
+        chains = await _get_cached_prerequisite_chain(planner, course_code, max_depth)
         
         if not chains:
             result = {
                 "course": course_code,
                 "prerequisite_chains": [],
                 "message": f"No prerequisite chains found for {course_code}. This course may have no prerequisites or may not exist in the knowledge graph.",
-                "recommendations": [
-                    "Verify the course code is correct",
-                    "Check if the course exists in the catalog",
-                    "This course may be suitable for early enrollment"
-                ]
+                "recommendations": _NO_PREREQUISITE_CHAIN_RECOMMENDATIONS
             }
         else:
-            # Find the longest and shortest paths
-            longest_path = max(chains, key=lambda x: len(x.path))
-            shortest_path = min(chains, key=lambda x: len(x.path))
+            # Find the longest and shortest paths in a single pass
+            path_lengths = [len(chain.path) for chain in chains]
+            longest_path = shortest_path = chains[0]
+            longest_length = shortest_length = path_lengths[0]
+            for chain, length in zip(chains, path_lengths):
+                if length > longest_length:
+                    longest_path, longest_length = chain, length
+                if length < shortest_length:
+                    shortest_path, shortest_length = chain, length
             
             result = {
                 "course": course_code,
@@ -3086,19 +3287,19 @@ async def get_prerequisite_chain(ctx: Context, course_code: str, max_depth: int
                         "path": chain.path,
                         "total_credits": chain.total_credits,
                         "estimated_semesters": chain.semesters_needed,
-                        "path_length": len(chain.path)
-                    } for chain in chains
+                        "path_length": length
+                    } for chain, length in zip(chains, path_lengths)
                 ],
                 "analysis": {
                     "total_chains_found": len(chains),
                     "longest_path": {
                         "courses": longest_path.path,
-                        "length": len(longest_path.path),
+                        "length": longest_length,
                         "credits": longest_path.total_credits
                     },
                     "shortest_path": {
                         "courses": shortest_path.path,
-                        "length": len(shortest_path.path),
+                        "length": shortest_length,
                         "credits": shortest_path.total_credits
                     }
                 },
@@ -3110,20 +3311,10 @@ async def get_prerequisite_chain(ctx: Context, course_code: str, max_depth: int
                 ]
             }
         
-        await planner.close()
-        return json.dumps(result, indent=2)
+        return _to_json(result)
         
     except Exception as e:
-        error_result = {
-            "error": f"Failed to analyze prerequisite chain: {str(e)}",
-            "course": course_code,
-            "troubleshooting": [
-                "Verify Neo4j connection is working",
-                "Check if academic knowledge graph is populated",
-                "Ensure course code format is correct (e.g., 'CS 1400')"
-            ]
-        }
-        return json.dumps(error_result, indent=2)
+        return _graph_error_json(f"Failed to analyze prerequisite chain: {str(e)}", course=course_code)
 
 @mcp.tool()
 async def validate_course_sequence(ctx: Context, course_list: str) -> str:
@@ -3142,33 +3333,24 @@ async def validate_course_sequence(ctx: Context, course_list: str) -> str:
     """
     try:
         # Parse course list
-        courses = [course.strip().upper() for course in course_list.split(',') if course.strip()]
+        courses = _parse_course_list(course_list)
         
         if not courses:
-            return json.dumps({
+            return _to_json({
                 "error": "No courses provided",
                 "message": "Please provide a comma-separated list of course codes"
-            }, indent=2)
+            }, indent=False)
         
-        planner = GraphEnhancedAcademicPlanner()
+        planner = await _get_planner()
         
         # Validate sequence
         validation = await planner.validate_course_sequence(courses)
         
         # Add recommendations based on validation results
-        recommendations = []
         if validation["valid"]:
-            recommendations.extend([
-                "✅ Course sequence is valid - no prerequisite violations detected",
-                "Consider course scheduling and availability when planning",
-                "Verify credit hour limits per semester"
-            ])
+            recommendations = list(_VALID_SEQUENCE_RECOMMENDATIONS)
         else:
-            recommendations.extend([
-                "❌ Prerequisite violations detected - sequence needs adjustment",
-                "Review prerequisite requirements for flagged courses",
-                "Consider reordering courses to satisfy prerequisites"
-            ])
+            recommendations = list(_INVALID_SEQUENCE_RECOMMENDATIONS)
         
         # Add IAP-specific recommendations
         stats = validation["statistics"]
@@ -3190,20 +3372,10 @@ async def validate_course_sequence(ctx: Context, course_list: str) -> str:
             "recommendations": recommendations
         }
         
-        await planner.close()
-        return json.dumps(result, indent=2)
+        return _to_json(result)
         
     except Exception as e:
-        error_result = {
-            "error": f"Failed to validate course sequence: {str(e)}",
-            "course_list": course_list,
-            "troubleshooting": [
-                "Verify Neo4j connection is working",
-                "Check if academic knowledge graph is populated",
-                "Ensure course codes are formatted correctly"
-            ]
-        }
-        return json.dumps(error_result, indent=2)
+        return _graph_error_json(f"Failed to validate course sequence: {str(e)}", course_list=course_list)
 
 @mcp.tool()
 async def recommend_course_sequence(ctx: Context, target_courses: str, max_semesters: int = 8) -> str:
@@ -3223,38 +3395,39 @@ async def recommend_course_sequence(ctx: Context, target_courses: str, max_semes
     """
     try:
         # Parse course list
-        courses = [course.strip().upper() for course in target_courses.split(',') if course.strip()]
+        courses = _parse_course_list(target_courses)
         
         if not courses:
-            return json.dumps({
+            return _to_json({
                 "error": "No courses provided",
                 "message": "Please provide a comma-separated list of course codes"
-            }, indent=2)
+            }, indent=False)
         
-        planner = GraphEnhancedAcademicPlanner()
+        planner = await _get_planner()
         
-        # Generate academic plan
-        plan = await planner.recommend_course_sequence(courses, max_semesters)
+        async with planner.session_scope():
+            # Generate academic plan
+            plan = await planner.recommend_course_sequence(courses, max_semesters)
+            
+            # Fetch details for every planned course in one query
+            all_codes = [course_code for semester in plan.recommended_sequence for course_code in semester]
+            course_details = await planner.get_courses_by_codes(all_codes)
         
         # Format semester sequence with details
         formatted_sequence = []
         for i, semester in enumerate(plan.recommended_sequence, 1):
-            semester_credits = 0
-            semester_courses = []
-            
-            for course_code in semester:
-                # This is a simplified approach - in a real implementation,
-                # you'd want to get actual course details from the graph
-                semester_courses.append({
+            semester_courses = [
+                {
                     "code": course_code,
-                    "credits": 3  # Default assumption
-                })
-                semester_credits += 3
+                    "title": course_details.get(course_code, {}).get("title"),
+                    "credits": course_details.get(course_code, {}).get("credits", 3)
+                } for course_code in semester
+            ]
             
             formatted_sequence.append({
                 "semester": i,
                 "courses": semester_courses,
-                "total_credits": semester_credits
+                "total_credits": sum(course["credits"] for course in semester_courses)
             })
         
         # Generate recommendations
@@ -3295,20 +3468,10 @@ async def recommend_course_sequence(ctx: Context, target_courses: str, max_semes
             "recommendations": recommendations
         }
         
-        await planner.close()
-        return json.dumps(result, indent=2)
+        return _to_json(result)
         
     except Exception as e:
-        error_result = {
-            "error": f"Failed to recommend course sequence: {str(e)}",
-            "target_courses": target_courses,
-            "troubleshooting": [
-                "Verify Neo4j connection is working",
-                "Check if academic knowledge graph is populated",
-                "Ensure course codes are formatted correctly"
-            ]
-        }
-        return json.dumps(error_result, indent=2)
+        return _graph_error_json(f"Failed to recommend course sequence: {str(e)}", target_courses=target_courses)
 
 @mcp.tool()
 async def analyze_degree_progress(ctx: Context, completed_courses: str, target_courses: str) -> str:
@@ -3317,6 +3480,8 @@ async def analyze_degree_progress(ctx: Context, completed_courses: str, target_c
     
     This tool provides comprehensive analysis of academic progress including
     completed requirements, remaining needs, and graduation readiness.
+    All course details are fetched in a single graph query, so latency tracks one
+    round-trip rather than the number of courses.
     
     Args:
         ctx: The MCP server provided context
@@ -3328,16 +3493,16 @@ async def analyze_degree_progress(ctx: Context, completed_courses: str, target_c
     """
     try:
         # Parse course lists
-        completed = [course.strip().upper() for course in completed_courses.split(',') if course.strip()]
-        target = [course.strip().upper() for course in target_courses.split(',') if course.strip()]
+        completed = _parse_course_list(completed_courses)
+        target = _parse_course_list(target_courses)
         
         if not target:
-            return json.dumps({
+            return _to_json({
                 "error": "No target courses provided",
                 "message": "Please provide target courses for degree completion analysis"
-            }, indent=2)
+            }, indent=False)
         
-        planner = GraphEnhancedAcademicPlanner()
+        planner = await _get_planner()
         
         # Analyze progress
         progress = await planner.analyze_degree_progress(completed, target)
@@ -3378,29 +3543,13 @@ async def analyze_degree_progress(ctx: Context, completed_courses: str, target_c
             "target_courses": target,
             "progress_analysis": progress,
             "recommendations": recommendations,
-            "next_steps": [
-                "Review remaining course list for scheduling",
-                "Check course prerequisites and availability",
-                "Consider course load and semester planning",
-                "Consult with academic advisor for final validation"
-            ]
+            "next_steps": _DEGREE_PROGRESS_NEXT_STEPS
         }
         
-        await planner.close()
-        return json.dumps(result, indent=2)
+        return _to_json(result)
         
     except Exception as e:
-        error_result = {
-            "error": f"Failed to analyze degree progress: {str(e)}",
-            "completed_courses": completed_courses,
-            "target_courses": target_courses,
-            "troubleshooting": [
-                "Verify Neo4j connection is working",
-                "Check if academic knowledge graph is populated",
-                "Ensure course codes are formatted correctly"
-            ]
-        }
-        return json.dumps(error_result, indent=2)
+        return _graph_error_json(f"Failed to analyze degree progress: {str(e)}", completed_courses=completed_courses, target_courses=target_courses)
 
 @mcp.tool()
 async def find_alternative_courses(ctx: Context, course_code: str, same_department: bool = True, limit: int = 5) -> str:
@@ -3420,7 +3569,13 @@ async def find_alternative_courses(ctx: Context, course_code: str, same_departme
         JSON string with alternative course suggestions and analysis
     """
     try:
-        planner = GraphEnhancedAcademicPlanner()
+        if not course_code.strip():
+            return _to_json({
+                "error": "No course code provided",
+                "message": "Please provide a course code (e.g., 'PSYC 1010')"
+            }, indent=False)
+        
+        planner = await _get_planner()
         
         # Find alternatives
         alternatives = await planner.find_alternative_courses(course_code, same_department)
@@ -3430,17 +3585,22 @@ async def find_alternative_courses(ctx: Context, course_code: str, same_departme
                 "original_course": course_code,
                 "alternatives": [],
                 "message": f"No alternative courses found for {course_code}",
-                "suggestions": [
-                    "Try expanding search to other departments (set same_department=False)",
-                    "Check if the course code is correct",
-                    "Consider courses with similar content or level",
-                    "Consult with academic advisor for manual alternatives"
-                ]
+                "suggestions": _NO_ALTERNATIVE_COURSE_SUGGESTIONS
             }
         else:
             # Limit results
             limited_alternatives = alternatives[:limit]
             
+            # Collect departments and credit range in a single pass
+            departments = set()
+            min_credits = max_credits = None
+            for alt in limited_alternatives:
+                departments.add(alt.department)
+                if min_credits is None or alt.credits < min_credits:
+                    min_credits = alt.credits
+                if max_credits is None or alt.credits > max_credits:
+                    max_credits = alt.credits
+            
             result = {
                 "original_course": course_code,
                 "alternatives": [
@@ -3451,50 +3611,137 @@ async def find_alternative_courses(ctx: Context, course_code: str, same_departme
                         "level": alt.level,
                         "department": alt.department,
                         "prerequisites": alt.prerequisites,
-                        "description_preview": alt.description[:200] + "..." if len(alt.description) > 200 else alt.description
+                        "description_preview": _preview(alt.description)
                     } for alt in limited_alternatives
                 ],
                 "analysis": {
                     "total_alternatives_found": len(alternatives),
                     "showing": len(limited_alternatives),
-                    "departments_represented": list(set(alt.department for alt in limited_alternatives)),
+                    "departments_represented": list(departments),
                     "credit_range": {
-                        "min": min(alt.credits for alt in limited_alternatives),
-                        "max": max(alt.credits for alt in limited_alternatives)
+                        "min": min_credits,
+                        "max": max_credits
                     }
                 },
-                "recommendations": [
-                    "Compare course descriptions and learning outcomes",
-                    "Verify prerequisites for alternative courses",
-                    "Check course scheduling and availability",
-                    "Confirm alternatives meet degree requirements",
-                    "Consult with academic advisor before substituting"
-                ]
+                "recommendations": _ALTERNATIVE_COURSE_RECOMMENDATIONS
             }
         
-        await planner.close()
-        return json.dumps(result, indent=2)
+        return _to_json(result)
         
     except Exception as e:
-        error_result = {
-            "error": f"Failed to find alternative courses: {str(e)}",
-            "course_code": course_code,
-            "troubleshooting": [
-                "Verify Neo4j connection is working",
-                "Check if academic knowledge graph is populated",
-                "Ensure course code format is correct"
-            ]
-        }
-        return json.dumps(error_result, indent=2)
+        return _graph_error_json(f"Failed to find alternative courses: {str(e)}", course_code=course_code)
 
 # ============================================================================
 # IAP (Individualized Academic Plan) Management Tools
 # ============================================================================
 
+# Troubleshooting hints returned when an IAP tool fails
+_CREATE_IAP_TROUBLESHOOTING = (
+    "Verify all required student information is provided",
+    "Check database connection",
+    "Ensure degree emphasis is descriptive and specific"
+)
+_UPDATE_IAP_TROUBLESHOOTING = (
+    "Verify student ID exists",
+    "Check section name is valid",
+    "Ensure data format is correct (JSON for complex data)"
+)
+_BOOTSTRAP_IAP_TROUBLESHOOTING = (
+    "Verify all required student information is provided",
+    "Check that sections is a JSON object keyed by valid section names",
+    "Ensure section data format matches what update_iap_section expects"
+)
+_IAP_SUGGESTIONS_TROUBLESHOOTING = (
+    "Verify degree emphasis is descriptive",
+    "Check section name is valid",
+    "Ensure context is properly formatted if provided"
+)
+_VALIDATE_IAP_TROUBLESHOOTING = (
+    "Verify student ID exists",
+    "Check IAP data format if provided",
+    "Ensure all required sections are present"
+)
+_MARKET_RESEARCH_TROUBLESHOOTING = (
+    "Verify degree emphasis is specified",
+    "Check geographic focus parameter",
+    "Ensure market data sources are accessible"
+)
+_GENERAL_EDUCATION_TROUBLESHOOTING = (
+    "Verify student ID is provided",
+    "Check course list format (JSON array or comma-separated)",
+    "Ensure course codes are valid Utah Tech courses"
+)
+_CONCENTRATION_AREAS_TROUBLESHOOTING = (
+    "Verify student ID is provided",
+    "Check concentration_areas format (JSON array or comma-separated)",
+    "Ensure course_mappings is valid JSON object",
+    "Verify course codes are properly formatted"
+)
+
+def _iap_error_json(error: str, troubleshooting: Tuple[str, ...]) -> str:
+    """Serialize an IAP tool failure as compact JSON with its troubleshooting hints."""
+    return _to_json({"success": False, "error": error, "troubleshooting": troubleshooting}, indent=False)
+
+def _iap_tool(error_prefix: str, troubleshooting: Tuple[str, ...], indent: bool = True):
+    """
+    Wrap an IAP tool so it returns its result dict as JSON, compact when indent is False.
+    Exceptions become the shared error payload, prefixed with error_prefix.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> str:
+            try:
+                return _to_json(await func(*args, **kwargs), indent=indent)
+            except Exception as e:
+                return _iap_error_json(f"{error_prefix}: {str(e)}", troubleshooting)
+        # FastMCP reads the wrapped signature; advertise the JSON string the wrapper returns
+        wrapper.__signature__ = inspect.signature(func).replace(return_annotation=str)
+        return wrapper
+    return decorator
+
+def _is_string_list(value: Any) -> bool:
+    """Check that a decoded JSON value is an array of strings."""
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+def _is_course_mapping(value: Any) -> bool:
+    """Check that a decoded JSON value maps area names to arrays of course codes."""
+    return isinstance(value, dict) and all(_is_string_list(courses) for courses in value.values())
+
+def _parse_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """Decode a JSON object argument, returning None for invalid JSON or any other JSON type."""
+    try:
+        value = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return None
+    return value if isinstance(value, dict) else None
+
+def _parse_string_list(text: str) -> Optional[List[str]]:
+    """
+    Decode a JSON array of strings, falling back to comma-separated text when the
+    argument is not JSON. Returns None when it is JSON of any other shape.
+    """
+    try:
+        value = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return [item for item in _COURSE_LIST_SEPARATOR.split(text.strip()) if item]
+    return value if _is_string_list(value) else None
+
+def _parse_course_entries(text: str) -> List[str]:
+    """
+    Split free text into course entries: the course codes found in each comma-separated
+    part (so pasted transcripts work), or the part itself when it holds no recognizable code.
+    """
+    entries = []
+    for part in _COURSE_LIST_SEPARATOR.split(text.strip()):
+        if part:
+            entries.extend(extract_course_codes(part) or (part,))
+    return entries
+
 @mcp.tool()
+@_iap_tool("Failed to create IAP template", _CREATE_IAP_TROUBLESHOOTING)
 async def create_iap_template(ctx: Context, student_name: str, student_id: str, 
                             degree_emphasis: str, student_email: str = "", 
-                            student_phone: str = "") -> str:
+                            student_phone: str = "") -> Dict[str, Any]:
     """
     Create a new IAP (Individualized Academic Plan) template for a student.
     
@@ -3523,33 +3770,19 @@ async def create_iap_template(ctx: Context, student_name: str, student_id: str,
     Returns:
         JSON string with IAP template creation results and next steps
     """
-    try:
-        supabase_client = get_supabase_from_context(ctx)
-        iap_manager = IAPManager(supabase_client)
-        result = await iap_manager.create_iap_template(
-            student_name=student_name,
-            student_id=student_id,
-            degree_emphasis=degree_emphasis,
-            student_email=student_email,
-            student_phone=student_phone
-        )
-        return json.dumps(result, indent=2)
-        
-    except Exception as e:
-        error_result = {
-            "success": False,
-            "error": f"Failed to create IAP template: {str(e)}",
-            "troubleshooting": [
-                "Verify all required student information is provided",
-                "Check database connection",
-                "Ensure degree emphasis is descriptive and specific"
-            ]
-        }
-        return json.dumps(error_result, indent=2)
+    iap_manager = get_iap_manager_from_context(ctx)
+    return iap_manager.create_iap_template(
+        student_name=student_name,
+        student_id=student_id,
+        degree_emphasis=degree_emphasis,
+        student_email=student_email,
+        student_phone=student_phone
+    )
 
 @mcp.tool()
+@_iap_tool("Failed to update IAP section", _UPDATE_IAP_TROUBLESHOOTING)
 async def update_iap_section(ctx: Context, student_id: str, section: str, 
-                           data: str) -> str:
+                           data: str) -> Dict[str, Any]:
     """
     Update a specific section of an IAP template.
     
@@ -3577,38 +3810,73 @@ async def update_iap_section(ctx: Context, student_id: str, section: str,
     Returns:
         JSON string with update results and confirmation
     """
+    # Parse data as JSON
     try:
-        # Parse data as JSON
-        try:
-            section_data = json.loads(data)
-        except json.JSONDecodeError:
-            # If not JSON, treat as plain text for simple sections
-            section_data = data
-        
-        supabase_client = get_supabase_from_context(ctx)
-        iap_manager = IAPManager(supabase_client)
-        result = await iap_manager.update_iap_section(
-            student_id=student_id,
-            section=section,
-            data=section_data
-        )
-        return json.dumps(result, indent=2)
-        
-    except Exception as e:
-        error_result = {
+        section_data = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # If not JSON, treat as plain text for simple sections
+        section_data = data
+    
+    iap_manager = get_iap_manager_from_context(ctx)
+    return await iap_manager.update_iap_section(
+        student_id=student_id,
+        section=section,
+        data=section_data
+    )
+
+@mcp.tool()
+@_iap_tool("Failed to bootstrap IAP", _BOOTSTRAP_IAP_TROUBLESHOOTING)
+async def bootstrap_iap(ctx: Context, student_name: str, student_id: str, 
+                        degree_emphasis: str, sections: str, 
+                        student_email: str = "", student_phone: str = "") -> Dict[str, Any]:
+    """
+    Create an IAP template and fill in its initial sections in a single call.
+    
+    Equivalent to create_iap_template followed by one update_iap_section call per
+    section, without the extra round-trips.
+    
+    **Student Collaboration Context:**
+    - **When to Use**: At the start of advising when the student already has drafts
+      (e.g., a mission statement or concentration areas) ready to record
+    - **How to Introduce**: "Let's set up your IAP with what you've already prepared"
+    - **Follow-up**: "Your IAP is started with your drafts in place. Which section should we refine first?"
+    
+    Args:
+        ctx: The MCP server provided context
+        student_name: Full name of the student
+        student_id: Student ID number
+        degree_emphasis: Proposed degree emphasis (e.g., "Psychology and Communication")
+        sections: JSON object mapping section names (mission_statement, program_goals, 
+                program_learning_outcomes, course_mappings, concentration_areas, 
+                cover_letter, academic_plan) to their initial data
+        student_email: Optional student email address
+        student_phone: Optional student phone number
+    
+    Returns:
+        JSON string with the populated IAP template and next steps
+    """
+    section_data = _parse_json_object(sections)
+    if section_data is None:
+        return {
             "success": False,
-            "error": f"Failed to update IAP section: {str(e)}",
-            "troubleshooting": [
-                "Verify student ID exists",
-                "Check section name is valid",
-                "Ensure data format is correct (JSON for complex data)"
-            ]
+            "error": "sections must be a JSON object mapping section names to their data",
+            "example": '{"mission_statement": "The BIS with an emphasis in ...", "concentration_areas": ["Psychology", "Communication", "Business"]}'
         }
-        return json.dumps(error_result, indent=2)
+    
+    iap_manager = get_iap_manager_from_context(ctx)
+    return iap_manager.bootstrap_iap(
+        student_name=student_name,
+        student_id=student_id,
+        degree_emphasis=degree_emphasis,
+        sections=section_data,
+        student_email=student_email,
+        student_phone=student_phone
+    )
 
 @mcp.tool()
+@_iap_tool("Failed to generate IAP suggestions", _IAP_SUGGESTIONS_TROUBLESHOOTING)
 async def generate_iap_suggestions(ctx: Context, degree_emphasis: str, 
-                                 section: str, context: str = "") -> str:
+                                 section: str, context: str = "") -> Dict[str, Any]:
     """
     Generate AI-powered suggestions for IAP content.
     
@@ -3637,39 +3905,24 @@ async def generate_iap_suggestions(ctx: Context, degree_emphasis: str,
     Returns:
         JSON string with AI-generated suggestions and customization tips
     """
-    try:
-        # Parse context if provided
-        context_data = {}
-        if context:
-            try:
-                context_data = json.loads(context)
-            except json.JSONDecodeError:
-                context_data = {"additional_info": context}
-        
-        supabase_client = get_supabase_from_context(ctx)
-        iap_manager = IAPManager(supabase_client)
-        result = await iap_manager.generate_iap_suggestions(
-            degree_emphasis=degree_emphasis,
-            section=section,
-            context=context_data
-        )
-        return json.dumps(result, indent=2)
-        
-    except Exception as e:
-        error_result = {
-            "success": False,
-            "error": f"Failed to generate IAP suggestions: {str(e)}",
-            "troubleshooting": [
-                "Verify degree emphasis is descriptive",
-                "Check section name is valid",
-                "Ensure context is properly formatted if provided"
-            ]
-        }
-        return json.dumps(error_result, indent=2)
+    # Parse context if provided; only text that opens like a JSON object is worth decoding
+    context_data = {}
+    if context:
+        context_data = _parse_json_object(context) if context.lstrip().startswith("{") else None
+        if context_data is None:
+            context_data = {"additional_info": context}
+    
+    iap_manager = get_iap_manager_from_context(ctx)
+    return iap_manager.generate_iap_suggestions(
+        degree_emphasis=degree_emphasis,
+        section=section,
+        context=context_data
+    )
 
 @mcp.tool()
+@_iap_tool("Failed to validate IAP", _VALIDATE_IAP_TROUBLESHOOTING, indent=False)
 async def validate_complete_iap(ctx: Context, student_id: str, 
-                              iap_data: str = "") -> str:
+                              iap_data: str = "") -> Dict[str, Any]:
     """
     Perform comprehensive validation of a complete IAP template.
     
@@ -3690,48 +3943,33 @@ async def validate_complete_iap(ctx: Context, student_id: str,
     Args:
         ctx: The MCP server provided context
         student_id: Student ID to identify the IAP template
-        iap_data: Optional JSON string with IAP data (if not retrieving from database)
+        iap_data: JSON string with IAP data (required until database retrieval is implemented)
     
     Returns:
         JSON string with comprehensive validation results and recommendations
     """
-    try:
-        # Parse IAP data if provided, otherwise would retrieve from database
-        if iap_data:
-            try:
-                iap_dict = json.loads(iap_data)
-            except json.JSONDecodeError:
-                return json.dumps({
-                    "success": False,
-                    "error": "Invalid JSON format for IAP data"
-                }, indent=2)
-        else:
-            # In full implementation, would retrieve from database using student_id
-            iap_dict = {
-                "student_id": student_id,
-                "message": "Database retrieval not implemented - provide iap_data parameter"
-            }
-        
-        supabase_client = get_supabase_from_context(ctx)
-        iap_manager = IAPManager(supabase_client)
-        result = await iap_manager.validate_iap_requirements(iap_dict)
-        return json.dumps(result, indent=2)
-        
-    except Exception as e:
-        error_result = {
+    # In full implementation, would retrieve from database using student_id when iap_data is empty
+    if not iap_data:
+        return {
             "success": False,
-            "error": f"Failed to validate IAP: {str(e)}",
-            "troubleshooting": [
-                "Verify student ID exists",
-                "Check IAP data format if provided",
-                "Ensure all required sections are present"
-            ]
+            "student_id": student_id,
+            "error": "Database retrieval not implemented - provide iap_data parameter"
+        }
+    
+    iap_dict = _parse_json_object(iap_data)
+    if iap_dict is None:
+        return {
+            "success": False,
+            "error": "Invalid JSON format for IAP data"
         }
-        return json.dumps(error_result, indent=2)
+    
+    iap_manager = get_iap_manager_from_context(ctx)
+    return iap_manager.validate_iap_requirements(iap_dict)
 
 @mcp.tool()
+@_iap_tool("Failed to conduct market research", _MARKET_RESEARCH_TROUBLESHOOTING, indent=False)
 async def conduct_market_research(ctx: Context, degree_emphasis: str, 
-                                geographic_focus: str = "Utah") -> str:
+                                geographic_focus: str = "Utah") -> Dict[str, Any]:
     """
     Conduct market research for degree viability analysis.
     
@@ -3758,30 +3996,16 @@ async def conduct_market_research(ctx: Context, degree_emphasis: str,
     Returns:
         JSON string with comprehensive market research data and viability assessment
     """
-    try:
-        supabase_client = get_supabase_from_context(ctx)
-        iap_manager = IAPManager(supabase_client)
-        result = await iap_manager.conduct_market_research(
-            degree_emphasis=degree_emphasis,
-            geographic_focus=geographic_focus
-        )
-        return json.dumps(result, indent=2)
-        
-    except Exception as e:
-        error_result = {
-            "success": False,
-            "error": f"Failed to conduct market research: {str(e)}",
-            "troubleshooting": [
-                "Verify degree emphasis is specified",
-                "Check geographic focus parameter",
-                "Ensure market data sources are accessible"
-            ]
-        }
-        return json.dumps(error_result, indent=2)
+    iap_manager = get_iap_manager_from_context(ctx)
+    return iap_manager.conduct_market_research(
+        degree_emphasis=degree_emphasis,
+        geographic_focus=geographic_focus
+    )
 
 @mcp.tool()
+@_iap_tool("Failed to track general education", _GENERAL_EDUCATION_TROUBLESHOOTING)
 async def track_general_education(ctx: Context, student_id: str, 
-                                course_list: str = "") -> str:
+                                course_list: str = "") -> Dict[str, Any]:
     """
     Track general education requirement completion for Utah Tech University.
     
@@ -3803,46 +4027,35 @@ async def track_general_education(ctx: Context, student_id: str,
     Args:
         ctx: The MCP server provided context
         student_id: Student's unique identifier
-        course_list: JSON array or comma-separated list of completed courses
+        course_list: JSON array of completed courses, or text listing them (e.g., comma-separated)
     
     Returns:
         JSON string with GE completion analysis and recommendations
     """
-    try:
-        # Parse course list
-        courses = []
-        if course_list:
-            try:
-                # Try parsing as JSON array first
-                courses = json.loads(course_list)
-            except json.JSONDecodeError:
-                # Fall back to comma-separated parsing
-                courses = [course.strip() for course in course_list.split(',') if course.strip()]
-        
-        supabase_client = get_supabase_from_context(ctx)
-        iap_manager = IAPManager(supabase_client)
-        result = await iap_manager.track_general_education(
-            student_id=student_id,
-            course_list=courses
-        )
-        return json.dumps(result, indent=2)
-        
-    except Exception as e:
-        error_result = {
-            "success": False,
-            "error": f"Failed to track general education: {str(e)}",
-            "troubleshooting": [
-                "Verify student ID is provided",
-                "Check course list format (JSON array or comma-separated)",
-                "Ensure course codes are valid Utah Tech courses"
-            ]
-        }
-        return json.dumps(error_result, indent=2)
+    # Parse course list
+    courses = []
+    if course_list:
+        try:
+            courses = orjson.loads(course_list)
+        except orjson.JSONDecodeError:
+            courses = _parse_course_entries(course_list)
+        if not _is_string_list(courses):
+            return {
+                "success": False,
+                "error": "course_list must be a JSON array of course codes or text listing them"
+            }
+    
+    iap_manager = get_iap_manager_from_context(ctx)
+    return iap_manager.track_general_education(
+        student_id=student_id,
+        course_list=courses
+    )
 
 @mcp.tool()
+@_iap_tool("Failed to validate concentration areas", _CONCENTRATION_AREAS_TROUBLESHOOTING)
 async def validate_concentration_areas(ctx: Context, student_id: str, 
                                      concentration_areas: str, 
-                                     course_mappings: str) -> str:
+                                     course_mappings: str) -> Dict[str, Any]:
     """
     Validate concentration area requirements and credit distribution.
     
@@ -3871,44 +4084,58 @@ async def validate_concentration_areas(ctx: Context, student_id: str,
     Returns:
         JSON string with detailed validation results and recommendations
     """
-    try:
-        # Parse concentration areas
-        try:
-            areas = json.loads(concentration_areas)
-        except json.JSONDecodeError:
-            areas = [area.strip() for area in concentration_areas.split(',') if area.strip()]
-        
-        # Parse course mappings
-        try:
-            mappings = json.loads(course_mappings)
-        except json.JSONDecodeError:
-            return json.dumps({
-                "success": False,
-                "error": "course_mappings must be valid JSON object",
-                "example": '{"Psychology": ["PSYC 1010", "PSYC 2010"], "Communication": ["COMM 1010", "COMM 2110"]}'
-            }, indent=2)
-        
-        supabase_client = get_supabase_from_context(ctx)
-        iap_manager = IAPManager(supabase_client)
-        result = await iap_manager.validate_concentration_areas(
-            student_id=student_id,
-            concentration_areas=areas,
-            course_mappings=mappings
-        )
-        return json.dumps(result, indent=2)
-        
-    except Exception as e:
-        error_result = {
+    # Parse concentration areas
+    areas = _parse_string_list(concentration_areas)
+    if areas is None:
+        return {
             "success": False,
-            "error": f"Failed to validate concentration areas: {str(e)}",
-            "troubleshooting": [
-                "Verify student ID is provided",
-                "Check concentration_areas format (JSON array or comma-separated)",
-                "Ensure course_mappings is valid JSON object",
-                "Verify course codes are properly formatted"
-            ]
+            "error": "concentration_areas must be a JSON array of area names or a comma-separated list"
         }
-        return json.dumps(error_result, indent=2)
+    
+    # Parse course mappings
+    mappings = _parse_json_object(course_mappings)
+    if not _is_course_mapping(mappings):
+        return {
+            "success": False,
+            "error": "course_mappings must be a JSON object mapping each area to a list of course codes",
+            "example": '{"Psychology": ["PSYC 1010", "PSYC 2010"], "Communication": ["COMM 1010", "COMM 2110"]}'
+        }
+    
+    iap_manager = get_iap_manager_from_context(ctx)
+    return iap_manager.validate_concentration_areas(
+        student_id=student_id,
+        concentration_areas=areas,
+        course_mappings=mappings
+    )
+
+def _strip_tool_docstrings():
+    """
+    Drop tool function docstrings once FastMCP has copied them into each tool's description.
+    The descriptions clients see are unaffected.
+    """
+    for tool in mcp._tool_manager.list_tools():
+        fn = tool.fn
+        while fn is not None:
+            fn.__doc__ = None
+            fn = getattr(fn, '__wrapped__', None)
+
+# Seconds uvicorn keeps an idle SSE connection open when SSE_KEEP_ALIVE_TIMEOUT is unset
+_DEFAULT_SSE_KEEP_ALIVE_TIMEOUT = 75
+
+def _sse_keep_alive_timeout() -> int:
+    """SSE_KEEP_ALIVE_TIMEOUT in seconds, falling back to the default when unset or invalid."""
+    value = os.getenv("SSE_KEEP_ALIVE_TIMEOUT", "").strip()
+    if not value:
+        return _DEFAULT_SSE_KEEP_ALIVE_TIMEOUT
+    try:
+        timeout = int(value)
+    except ValueError:
+        timeout = -1
+    if timeout < 0:
+        print(f"Ignoring SSE_KEEP_ALIVE_TIMEOUT={value!r}: expected a whole number of seconds; "
+              f"using {_DEFAULT_SSE_KEEP_ALIVE_TIMEOUT}", file=sys.stderr)
+        return _DEFAULT_SSE_KEEP_ALIVE_TIMEOUT
+    return timeout
 
 async def main():
     """Main function to run the MCP server"""
@@ -3916,12 +4143,27 @@ async def main():
     transport = os.getenv("TRANSPORT", "sse")
     if transport == 'sse':
         print("Starting MCP server in SSE mode")
-        # Run the MCP server with sse transport
-        await mcp.run_sse_async()
+        # Run the SSE app under uvicorn directly (as mcp.run_sse_async does) so idle
+        # keep-alive connections outlive the gap between an agent's tool calls
+        config = uvicorn.Config(
+            mcp.sse_app(),
+            host=mcp.settings.host,
+            port=mcp.settings.port,
+            log_level=mcp.settings.log_level.lower(),
+            timeout_keep_alive=_sse_keep_alive_timeout()
+        )
+        await uvicorn.Server(config).serve()
     else:
         print("Starting MCP server in STDIO mode")
         # Run the MCP server with stdio transport
         await mcp.run_stdio_async()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if os.getenv("MCP_STRIP_DOCS", "false") == "true":
+        _strip_tool_docstrings()
+    if sys.platform == "win32":
+        asyncio.run(main())
+    else:
+        # uvloop is not available on Windows
+        import uvloop
+        asyncio.run(main(), loop_factory=uvloop.new_event_loop)
\ No newline at end of file
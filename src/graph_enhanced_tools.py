@@ -9,9 +9,15 @@ These tools enable intelligent academic advising for Utah Tech's IAP (Individual
 import asyncio
 import json
 import re
-from typing import List, Dict, Any, Optional, Tuple, Set
+import sys
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import List, Dict, Any, Optional, Tuple, FrozenSet
 from dataclasses import dataclass
-from neo4j import AsyncGraphDatabase
+from collections import defaultdict, deque
+from graphlib import CycleError, TopologicalSorter
+from neo4j import AsyncDriver, AsyncGraphDatabase, READ_ACCESS, RoutingControl
 from dotenv import load_dotenv
 import os
 
@@ -45,10 +51,187 @@ class AcademicPlan:
     courses: List[str]
     total_credits: int
     upper_division_credits: int
-    disciplines: Set[str]
+    disciplines: FrozenSet[str]
     prerequisite_violations: List[str]
     recommended_sequence: List[List[str]]  # Semester-by-semester
 
+MAX_PREREQUISITE_DEPTH = 10
+
+# Courses without a credit value (missing or 0) count as 3 credits; the default is applied
+# in every query that reads credits, so graphs loaded without it still read consistently
+DEFAULT_COURSE_CREDITS = 3
+
+def _credits(node: str) -> str:
+    """Cypher expression for a course node's credits with the default applied"""
+    return f"CASE WHEN {node}.credits IS NULL OR {node}.credits = 0 THEN {DEFAULT_COURSE_CREDITS} ELSE {node}.credits END"
+
+# Direct prerequisites listed per course; collect() already drops the nulls an OPTIONAL MATCH
+# yields, and DISTINCT drops repeats from duplicate PREREQUISITE_FOR edges
+MAX_LISTED_PREREQUISITES = 20
+
+# Materialized-path properties: every ancestor code within MAX_PREREQUISITE_DEPTH hops
+# and the longest prerequisite chain length, recomputed whenever the graph is rebuilt
+_REFRESH_MATERIALIZED_PATHS_QUERY = f"""
+    MATCH (course:Course)
+    OPTIONAL MATCH path = (prereq:Course)-[:PREREQUISITE_FOR*1..{MAX_PREREQUISITE_DEPTH}]->(course)
+    WITH course, collect(DISTINCT prereq.code) as ancestors, max(length(path)) as depth
+    SET course.all_prereqs = ancestors,
+        course.prereq_depth = coalesce(depth, 0)
+"""
+
+# Fixed query text, so the server-side plan cache (keyed on the text) is hit on every call
+_COURSE_PREREQUISITES_QUERY = """
+    MATCH (prereq:Course)-[:PREREQUISITE_FOR]->(course:Course {code: $course_code})
+    RETURN prereq.code as prerequisite
+    ORDER BY prereq.code
+"""
+
+_COURSE_DETAILS_QUERY = f"""
+    UNWIND $course_codes AS code
+    MATCH (course:Course {{code: code}})
+    OPTIONAL MATCH (prereq:Course)-[:PREREQUISITE_FOR]->(course)
+    RETURN course.code as code,
+           course.title as title,
+           {_credits("course")} as credits,
+           course.level as level,
+           course.department as department,
+           collect(DISTINCT prereq.code)[..{MAX_LISTED_PREREQUISITES}] as prerequisites
+"""
+
+# Totals for several named course lists in one round trip, one row per list with a match
+_COURSE_AGGREGATE_QUERY = f"""
+    UNWIND $groups AS grp
+    UNWIND grp.codes AS code
+    MATCH (course:Course {{code: code}})
+    WITH grp.name as name, course, {_credits("course")} as credits
+    RETURN name,
+           count(course) as courses,
+           sum(credits) as credits,
+           sum(CASE WHEN course.level = 'upper-division' THEN credits ELSE 0 END) as upper_division_credits,
+           collect(DISTINCT course.department) as disciplines
+"""
+
+_COURSE_ANCESTORS_QUERY = """
+    MATCH (course:Course {code: $course_code})
+    RETURN course.all_prereqs as ancestors
+"""
+
+_PREREQUISITE_EDGES_QUERY = f"""
+    UNWIND $frontier AS code
+    MATCH (p:Course)-[:PREREQUISITE_FOR]->(c:Course {{code: code}})
+    RETURN code, {_credits("c")} as credits,
+           collect({{code: p.code, credits: {_credits("p")}}}) as prerequisites
+"""
+
+_COURSE_PROFILE_QUERY = f"""
+    MATCH (course:Course {{code: $course_code}})
+    RETURN course.level as level, course.department as department, {_credits("course")} as credits
+"""
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a course code or department name read from Neo4j; they recur across every lookup"""
+    return sys.intern(value) if value is not None else None
+
+def _course_listing_query(node: str, predicates: Tuple[str, ...],
+                          description_chars: Optional[int] = None,
+                          max_prerequisites: Optional[int] = None) -> str:
+    """Cypher listing the courses bound to `node` that satisfy every predicate"""
+    description = f"{node}.description"
+    if description_chars:
+        description = f"left({description}, {description_chars})"
+    prerequisites = f"collect(DISTINCT prereq.code)[..{max_prerequisites or MAX_LISTED_PREREQUISITES}]"
+    
+    # LIMIT is applied before the prerequisite expansion so only returned courses are expanded
+    return f"""
+        MATCH ({node}:Course)
+        WHERE {' AND '.join(predicates)}
+        WITH {node}
+        ORDER BY {node}.code
+        LIMIT $limit
+        OPTIONAL MATCH (prereq:Course)-[:PREREQUISITE_FOR]->({node})
+        RETURN {node}.code as code,
+               {node}.title as title,
+               {_credits(node)} as credits,
+               {node}.level as level,
+               {node}.department as department,
+               {description} as description,
+               {prerequisites} as prerequisites
+        ORDER BY {node}.code
+    """
+
+# Query text is fixed per filter combination (keyed by the bound parameter names other
+# than limit) so Neo4j's plan cache, which is keyed on the text, is reused across calls
+_FIND_BY_LEVEL_QUERIES = {
+    frozenset({"level"}): _course_listing_query(
+        "course", ("course.level = $level",)),
+    frozenset({"level", "department"}): _course_listing_query(
+        "course", ("course.level = $level", "course.department = $department")),
+}
+
+# Alternatives are shown as a candidate list with a description preview, so each row
+# carries only the start of the description and a bounded prerequisite list
+ALTERNATIVE_DESCRIPTION_CHARS = 500
+ALTERNATIVE_MAX_PREREQUISITES = 10
+
+def _alternative_courses_query(*predicates: str) -> str:
+    """Alternative-course listing for the same level, excluding the original course"""
+    return _course_listing_query(
+        "alt", ("alt.level = $level", "alt.code <> $course_code") + predicates,
+        description_chars=ALTERNATIVE_DESCRIPTION_CHARS,
+        max_prerequisites=ALTERNATIVE_MAX_PREREQUISITES
+    )
+
+# Credits are compared on the stored property, which the graph builder backfills, so the
+# (level, credits) index applies; the CASE default in _credits() would force a scan
+_FIND_ALTERNATIVE_QUERIES = {
+    frozenset({"course_code", "level"}): _alternative_courses_query(),
+    frozenset({"course_code", "level", "department"}): _alternative_courses_query(
+        "alt.department = $department"),
+    frozenset({"course_code", "level", "credits"}): _alternative_courses_query(
+        "alt.credits = $credits"),
+    frozenset({"course_code", "level", "department", "credits"}): _alternative_courses_query(
+        "alt.department = $department", "alt.credits = $credits"),
+}
+
+# One driver (and so one connection pool) per process, shared by every planner instance
+_DRIVER: Optional[AsyncDriver] = None
+_DRIVER_LOCK = asyncio.Lock()
+
+async def get_driver(uri: str, auth: Tuple[str, str]) -> AsyncDriver:
+    """Return the shared Neo4j driver, creating it on first use"""
+    global _DRIVER
+    if _DRIVER is None:
+        async with _DRIVER_LOCK:
+            if _DRIVER is None:
+                _DRIVER = AsyncGraphDatabase.driver(
+                    uri,
+                    auth=auth,
+                    max_connection_pool_size=50,
+                    connection_acquisition_timeout=30,
+                    connection_timeout=10,
+                    keep_alive=True
+                )
+    return _DRIVER
+
+async def close_driver():
+    """Close the shared Neo4j driver, e.g. on server shutdown"""
+    global _DRIVER
+    if _DRIVER is not None:
+        driver, _DRIVER = _DRIVER, None
+        await driver.close()
+
+def _course_node(record) -> CourseNode:
+    """Build a CourseNode from a course-listing record"""
+    return CourseNode(
+        code=_intern(record["code"]),
+        title=record["title"],
+        credits=record["credits"],
+        level=record["level"],
+        department=_intern(record["department"]),
+        description=record["description"] or "",
+        prerequisites=[_intern(p) for p in record["prerequisites"]]
+    )
+
 class GraphEnhancedAcademicPlanner:
     """
     Advanced academic planning using Neo4j knowledge graph with prerequisite relationships.
@@ -60,150 +243,323 @@ class GraphEnhancedAcademicPlanner:
         self.neo4j_user = os.getenv('NEO4J_USER', 'neo4j')
         self.neo4j_password = os.getenv('NEO4J_PASSWORD', 'password123')
         self.driver = None
+        
+        # Course data only changes when the graph is rebuilt, so read lookups are
+        # memoized for cache_ttl seconds and cleared by invalidate_cache()
+        self.cache_ttl = float(os.getenv('GRAPH_CACHE_TTL') or 3600)
+        self._cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        
+        # (session, lock) opened by session_scope() for the current tool invocation
+        self._scoped_session: ContextVar[Optional[Tuple[Any, asyncio.Lock]]] = ContextVar(
+            "scoped_session", default=None
+        )
     
     async def connect(self):
         """Connect to Neo4j database"""
         if not self.driver:
-            self.driver = AsyncGraphDatabase.driver(
-                self.neo4j_uri,
-                auth=(self.neo4j_user, self.neo4j_password)
-            )
+            self.driver = await get_driver(self.neo4j_uri, (self.neo4j_user, self.neo4j_password))
         return self.driver
     
     async def close(self):
-        """Close Neo4j connection"""
-        if self.driver:
-            await self.driver.close()
-            self.driver = None
+        """Release this planner's reference to the shared driver; close_driver() closes the pool"""
+        self.driver = None
+    
+    @asynccontextmanager
+    async def session_scope(self):
+        """Share one read session across the planner calls made inside this block"""
+        if self._scoped_session.get() is not None:
+            yield
+            return
+        
+        driver = await self.connect()
+        async with driver.session(default_access_mode=READ_ACCESS) as session:
+            token = self._scoped_session.set((session, asyncio.Lock()))
+            try:
+                yield
+            finally:
+                self._scoped_session.reset(token)
+    
+    @asynccontextmanager
+    async def _read_transaction(self):
+        """Run a lookup's statements in one explicit read transaction"""
+        scope = self._scoped_session.get()
+        if scope is not None:
+            # Sessions are not safe for concurrent use, so gathered lookups take turns
+            session, lock = scope
+            async with lock:
+                async with await session.begin_transaction() as tx:
+                    yield tx
+            return
+        
+        driver = await self.connect()
+        async with driver.session(default_access_mode=READ_ACCESS) as session:
+            async with await session.begin_transaction() as tx:
+                yield tx
+    
+    async def _read_records(self, query: str, **params) -> List[Any]:
+        """Run a single read statement and return all of its records"""
+        if self._scoped_session.get() is not None:
+            async with self._read_transaction() as tx:
+                result = await tx.run(query, **params)
+                return (await result.to_eager_result()).records
+        
+        # Outside a scope the driver manages the session and transaction itself
+        driver = await self.connect()
+        records, _, _ = await driver.execute_query(query, params, routing_=RoutingControl.READ)
+        return records
+    
+    def invalidate_cache(self):
+        """Drop all memoized course lookups, e.g. after the knowledge graph is rebuilt"""
+        self._cache.clear()
+    
+    def _cache_lookup(self, key: Tuple) -> Tuple[bool, Any]:
+        """Return (hit, value) for a cache key, treating expired entries as misses"""
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.cache_ttl:
+            return True, entry[1]
+        return False, None
+    
+    async def _cached(self, key: Tuple, loader):
+        """Return a memoized lookup, sharing one in-flight query between concurrent misses"""
+        hit, value = self._cache_lookup(key)
+        if hit:
+            return value
+        
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(loader())
+            self._inflight[key] = pending
+            try:
+                # Shielded so a cancelled caller does not cancel the query others are awaiting
+                value = await asyncio.shield(pending)
+            finally:
+                del self._inflight[key]
+            self._cache[key] = (time.monotonic(), value)
+            return value
+        
+        return await asyncio.shield(pending)
     
     async def get_course_prerequisites(self, course_code: str) -> List[str]:
         """Get direct prerequisites for a course"""
-        driver = await self.connect()
+        return await self._cached(
+            ("prerequisites", course_code),
+            lambda: self._query_course_prerequisites(course_code)
+        )
+    
+    async def _query_course_prerequisites(self, course_code: str) -> List[str]:
+        records = await self._read_records(_COURSE_PREREQUISITES_QUERY, course_code=course_code)
         
-        async with driver.session() as session:
-            result = await session.run("""
-                MATCH (prereq:Course)-[:PREREQUISITE_FOR]->(course:Course {code: $course_code})
-                RETURN prereq.code as prerequisite
-                ORDER BY prereq.code
-            """, course_code=course_code)
-            
-            prerequisites = []
-            async for record in result:
-                prerequisites.append(record["prerequisite"])
-            
-            return prerequisites
+        return [_intern(record["prerequisite"]) for record in records]
+    
+    async def get_courses_by_codes(self, course_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get basic details for a batch of courses, sharing the cached course details"""
+        details = await self.get_course_details(course_codes)
+        return {
+            course_code: {
+                "code": info["code"],
+                "title": info["title"],
+                "credits": info["credits"],
+                "level": info["level"],
+                "department": info["department"]
+            }
+            for course_code, info in details.items()
+        }
+    
+    async def get_course_details(self, course_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get details and direct prerequisites for a batch of courses, querying only uncached codes"""
+        courses = {}
+        missing = []
+        for course_code in dict.fromkeys(course_codes):
+            hit, info = self._cache_lookup(("details", course_code))
+            if not hit:
+                missing.append(course_code)
+            elif info is not None:
+                courses[course_code] = info
+        
+        if missing:
+            fetched = await self._query_course_details(missing)
+            now = time.monotonic()
+            for course_code in missing:
+                # Unknown codes are cached as None so they are not re-queried
+                info = fetched.get(course_code)
+                self._cache[("details", course_code)] = (now, info)
+                if info is not None:
+                    courses[course_code] = info
+        
+        return courses
+    
+    async def _query_course_details(self, course_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+        records = await self._read_records(_COURSE_DETAILS_QUERY, course_codes=course_codes)
+        
+        courses = {}
+        for record in records:
+            code = _intern(record["code"])
+            courses[code] = {
+                "code": code,
+                "title": record["title"],
+                "credits": record["credits"],
+                "level": record["level"],
+                "department": _intern(record["department"]),
+                "prerequisites": [_intern(p) for p in record["prerequisites"]]
+            }
+        
+        return courses
+    
+    async def aggregate_course_groups(self, groups: Dict[str, List[str]]) -> Dict[str, Dict[str, Any]]:
+        """Total credits, upper-division credits and departments for each named list of courses"""
+        return await self._cached(
+            ("aggregate", tuple((name, tuple(sorted(codes))) for name, codes in groups.items())),
+            lambda: self._query_course_aggregate(groups)
+        )
+    
+    async def _query_course_aggregate(self, groups: Dict[str, List[str]]) -> Dict[str, Dict[str, Any]]:
+        records = await self._read_records(
+            _COURSE_AGGREGATE_QUERY,
+            groups=[{"name": name, "codes": codes} for name, codes in groups.items()]
+        )
+        
+        # Lists without a single known course produce no row
+        totals = {
+            name: {"courses": 0, "credits": 0, "upper_division_credits": 0, "disciplines": []}
+            for name in groups
+        }
+        for record in records:
+            totals[record["name"]] = {
+                "courses": record["courses"],
+                "credits": record["credits"],
+                "upper_division_credits": record["upper_division_credits"],
+                "disciplines": [_intern(d) for d in record["disciplines"]]
+            }
+        return totals
     
     async def get_prerequisite_chain(self, course_code: str, max_depth: int = 10) -> List[PrerequisitePath]:
         """Get complete prerequisite chain for a course"""
-        driver = await self.connect()
+        if max_depth < 1:
+            return []
         
-        async with driver.session() as session:
-            result = await session.run("""
-                MATCH path = (start:Course)-[:PREREQUISITE_FOR*1..10]->(target:Course {code: $course_code})
-                WITH path, length(path) as depth
-                WHERE depth <= $max_depth
-                RETURN [node in nodes(path) | node.code] as course_path,
-                       [node in nodes(path) | node.credits] as credit_path,
-                       depth
-                ORDER BY depth DESC
-            """, course_code=course_code, max_depth=max_depth)
-            
-            paths = []
-            async for record in result:
-                course_path = record["course_path"]
-                credit_path = record["credit_path"]
-                depth = record["depth"]
-                
-                # Calculate total credits and estimated semesters
-                total_credits = sum(credit_path)
-                semesters_needed = max(1, (depth + 1) // 2)  # Rough estimate
-                
+        max_depth = min(max_depth, MAX_PREREQUISITE_DEPTH)
+        edges, credits = await self._bfs_ancestors(course_code, max_depth)
+        
+        # Walk the collected edges back out into every chain ending at the target,
+        # matching the paths the variable-length pattern used to enumerate
+        paths = []
+        stack = [[course_code]]
+        while stack:
+            chain = stack.pop()
+            depth = len(chain) - 1
+            if depth:
                 paths.append(PrerequisitePath(
                     target_course=course_code,
-                    path=course_path,
-                    total_credits=total_credits,
-                    semesters_needed=semesters_needed
+                    path=chain,
+                    total_credits=sum(credits.get(code) for code in chain),
+                    semesters_needed=max(1, (depth + 1) // 2)  # Rough estimate
                 ))
+            if depth < max_depth:
+                stack.extend([prereq] + chain for prereq in edges.get(chain[0], ()))
+        
+        paths.sort(key=lambda p: len(p.path), reverse=True)
+        return paths
+    
+    async def _bfs_ancestors(self, course_code: str, max_depth: int) -> Tuple[Dict[str, List[str]], Dict[str, Any]]:
+        """Collect prerequisite edges up to max_depth hops, one batched query per frontier"""
+        edges: Dict[str, List[str]] = {}
+        credits: Dict[str, Any] = {}
+        frontier = {course_code}
+        
+        async with self._read_transaction() as tx:
+            result = await tx.run(_COURSE_ANCESTORS_QUERY, course_code=course_code)
+            record = await result.single()
+            if record is None:
+                return edges, credits
+            
+            # With materialized ancestors every edge comes back in a single round trip;
+            # without them the walk goes outwards one hop per query
+            rounds = max_depth
+            if record["ancestors"] is not None:
+                frontier.update(record["ancestors"])
+                rounds = 1
+            visited = set(frontier)
             
-            return paths
+            for _ in range(rounds):
+                result = await tx.run(_PREREQUISITE_EDGES_QUERY, frontier=list(frontier))
+                records = (await result.to_eager_result()).records
+                
+                next_frontier = set()
+                for record in records:
+                    code = _intern(record["code"])
+                    credits[code] = record["credits"]
+                    edges[code] = []
+                    for prereq in record["prerequisites"]:
+                        prereq_code = _intern(prereq["code"])
+                        edges[code].append(prereq_code)
+                        credits[prereq_code] = prereq["credits"]
+                        if prereq_code not in visited:
+                            next_frontier.add(prereq_code)
+                
+                if not next_frontier:
+                    break
+                visited |= next_frontier
+                frontier = next_frontier
+        
+        return edges, credits
+    
+    async def refresh_materialized_paths(self):
+        """Store each course's ancestor codes and prerequisite depth on its node
+        
+        Must run after PREREQUISITE_FOR edges change (the graph build does this) so the
+        stored ancestor sets stay in step with the edges get_prerequisite_chain walks.
+        """
+        driver = await self.connect()
+        async with driver.session() as session:
+            result = await session.run(_REFRESH_MATERIALIZED_PATHS_QUERY)
+            await result.consume()
+        self.invalidate_cache()
     
     async def find_courses_by_level(self, level: str, department: str = None, limit: int = 50) -> List[CourseNode]:
         """Find courses by level (upper-division, lower-division, graduate)"""
-        driver = await self.connect()
-        
-        # Build query based on parameters
-        where_clauses = ["course.level = $level"]
+        return await self._cached(
+            ("courses_by_level", level, department, limit),
+            lambda: self._query_courses_by_level(level, department, limit)
+        )
+    
+    async def _query_courses_by_level(self, level: str, department: Optional[str], limit: int) -> List[CourseNode]:
         params = {"level": level, "limit": limit}
-        
         if department:
-            where_clauses.append("course.department = $department")
             params["department"] = department
+        query = _FIND_BY_LEVEL_QUERIES[frozenset(params.keys() - {"limit"})]
         
-        where_clause = " AND ".join(where_clauses)
-        
-        async with driver.session() as session:
-            result = await session.run(f"""
-                MATCH (course:Course)
-                WHERE {where_clause}
-                OPTIONAL MATCH (prereq:Course)-[:PREREQUISITE_FOR]->(course)
-                RETURN course.code as code,
-                       course.title as title,
-                       course.credits as credits,
-                       course.level as level,
-                       course.department as department,
-                       course.description as description,
-                       collect(prereq.code) as prerequisites
-                ORDER BY course.code
-                LIMIT $limit
-            """, **params)
-            
-            courses = []
-            async for record in result:
-                courses.append(CourseNode(
-                    code=record["code"],
-                    title=record["title"],
-                    credits=record["credits"] or 3,  # Default to 3 credits
-                    level=record["level"],
-                    department=record["department"],
-                    description=record["description"] or "",
-                    prerequisites=[p for p in record["prerequisites"] if p]
-                ))
-            
-            return courses
+        records = await self._read_records(query, **params)
+        return [_course_node(record) for record in records]
     
     async def validate_course_sequence(self, course_codes: List[str]) -> Dict[str, Any]:
         """Validate if a sequence of courses respects prerequisite requirements"""
-        driver = await self.connect()
-        
         violations = []
-        course_info = {}
         
-        # Get course information and prerequisites
-        async with driver.session() as session:
-            for course_code in course_codes:
-                result = await session.run("""
-                    MATCH (course:Course {code: $course_code})
-                    OPTIONAL MATCH (prereq:Course)-[:PREREQUISITE_FOR]->(course)
-                    RETURN course.code as code,
-                           course.title as title,
-                           course.credits as credits,
-                           course.level as level,
-                           course.department as department,
-                           collect(prereq.code) as prerequisites
-                """, course_code=course_code)
-                
-                record = await result.single()
-                if record:
-                    course_info[course_code] = {
-                        "code": record["code"],
-                        "title": record["title"],
-                        "credits": record["credits"] or 3,
-                        "level": record["level"],
-                        "department": record["department"],
-                        "prerequisites": [p for p in record["prerequisites"] if p]
-                    }
-        
-        # Check prerequisite violations
+        # Get course information and prerequisites, keeping the sequence order
+        details = await self.get_course_details(course_codes)
+        course_info = {
+            course_code: details[course_code]
+            for course_code in course_codes
+            if course_code in details
+        }
+        
+        if not course_info:
+            return {
+                "valid": True,
+                "violations": [],
+                "statistics": {
+                    "total_courses": 0,
+                    "total_credits": 0,
+                    "upper_division_credits": 0,
+                    "disciplines": [],
+                    "discipline_count": 0
+                },
+                "course_details": {}
+            }
+        
+        # Check prerequisite violations. The prerequisite lists arrive with the (cached) details
+        # above, so this is a local set check rather than a second, server-side query
         completed_courses = set()
         for course_code in course_codes:
             if course_code in course_info:
@@ -219,13 +575,17 @@ class GraphEnhancedAcademicPlanner:
                 
                 completed_courses.add(course_code)
         
-        # Calculate statistics
-        total_credits = sum(info["credits"] for info in course_info.values())
-        upper_division_credits = sum(
-            info["credits"] for info in course_info.values() 
-            if info["level"] == "upper-division"
-        )
-        disciplines = set(info["department"] for info in course_info.values())
+        # Calculate statistics in a single pass
+        total_credits = 0
+        upper_division_credits = 0
+        departments = set()
+        for info in course_info.values():
+            credits = info["credits"]
+            total_credits += credits
+            if info["level"] == "upper-division":
+                upper_division_credits += credits
+            departments.add(info["department"])
+        disciplines = frozenset(departments)
         
         return {
             "valid": len(violations) == 0,
@@ -242,50 +602,48 @@ class GraphEnhancedAcademicPlanner:
     
     async def recommend_course_sequence(self, target_courses: List[str], max_credits_per_semester: int = 15, max_semesters: int = 8) -> AcademicPlan:
         """Recommend optimal course sequence respecting prerequisites"""
-        driver = await self.connect()
-        
         # Get all courses and their prerequisites
         all_courses = {}
         prerequisite_graph = {}
         
-        async with driver.session() as session:
-            # Get course information
-            for course_code in target_courses:
-                result = await session.run("""
-                    MATCH (course:Course {code: $course_code})
-                    OPTIONAL MATCH (prereq:Course)-[:PREREQUISITE_FOR]->(course)
-                    RETURN course.code as code,
-                           course.title as title,
-                           course.credits as credits,
-                           course.level as level,
-                           course.department as department,
-                           collect(prereq.code) as prerequisites
-                """, course_code=course_code)
-                
-                record = await result.single()
-                if record:
-                    all_courses[course_code] = CourseNode(
-                        code=record["code"],
-                        title=record["title"],
-                        credits=record["credits"] or 3,
-                        level=record["level"],
-                        department=record["department"],
-                        description="",
-                        prerequisites=[p for p in record["prerequisites"] if p]
-                    )
-                    prerequisite_graph[course_code] = [p for p in record["prerequisites"] if p]
+        details = await self.get_course_details(target_courses)
+        for course_code in target_courses:
+            info = details.get(course_code)
+            if info:
+                all_courses[course_code] = CourseNode(
+                    code=info["code"],
+                    title=info["title"],
+                    credits=info["credits"],
+                    level=info["level"],
+                    department=info["department"],
+                    description="",
+                    prerequisites=info["prerequisites"]
+                )
+                prerequisite_graph[course_code] = info["prerequisites"]
         
         # Topological sort to determine course order
-        sequence = self._topological_sort(target_courses, prerequisite_graph)
+        sequence, cycle = self._topological_sort(target_courses, prerequisite_graph)
         
         # Group courses into semesters (assuming 15 credits per semester max)
+        sequence = [course_code for course_code in sequence if course_code in all_courses]
+        
+        # Courses in or behind a prerequisite cycle cannot be sequenced, so report them instead
+        scheduled = set(sequence)
+        prerequisite_violations = [
+            f"{course_code} was left out of the sequence because of the prerequisite cycle {' -> '.join(cycle)}"
+            for course_code in all_courses if course_code not in scheduled
+        ]
         semester_sequence = []
-        current_semester = []
-        current_credits = 0
-        # Use the provided max_credits_per_semester parameter
         
-        for course_code in sequence:
-            if course_code in all_courses:
+        if sum(all_courses[course_code].credits for course_code in sequence) <= max_credits_per_semester:
+            # Everything fits in one semester, so there is nothing to pack
+            if sequence:
+                semester_sequence.append(sequence)
+        else:
+            current_semester = []
+            current_credits = 0
+            
+            for course_code in sequence:
                 course = all_courses[course_code]
                 
                 # Check if adding this course would exceed semester credit limit
@@ -296,65 +654,88 @@ class GraphEnhancedAcademicPlanner:
                 else:
                     current_semester.append(course_code)
                     current_credits += course.credits
+            
+            # Add final semester if not empty
+            if current_semester:
+                semester_sequence.append(current_semester)
         
-        # Add final semester if not empty
-        if current_semester:
-            semester_sequence.append(current_semester)
-        
-        # Calculate plan statistics
-        total_credits = sum(course.credits for course in all_courses.values())
-        upper_division_credits = sum(
-            course.credits for course in all_courses.values() 
-            if course.level == "upper-division"
-        )
-        disciplines = set(course.department for course in all_courses.values())
+        # Calculate plan statistics in a single pass
+        total_credits = 0
+        upper_division_credits = 0
+        departments = set()
+        for course in all_courses.values():
+            total_credits += course.credits
+            if course.level == "upper-division":
+                upper_division_credits += course.credits
+            departments.add(course.department)
+        disciplines = frozenset(departments)
         
         return AcademicPlan(
             courses=list(all_courses.keys()),
             total_credits=total_credits,
             upper_division_credits=upper_division_credits,
             disciplines=disciplines,
-            prerequisite_violations=[],  # Should be none with proper sequencing
+            prerequisite_violations=prerequisite_violations,
             recommended_sequence=semester_sequence
         )
     
-    def _topological_sort(self, courses: List[str], prerequisite_graph: Dict[str, List[str]]) -> List[str]:
-        """Perform topological sort on course prerequisite graph"""
-        # Build in-degree count
+    def _topological_sort(self, courses: List[str], prerequisite_graph: Dict[str, List[str]]) -> Tuple[List[str], List[str]]:
+        """Perform topological sort on course prerequisite graph
+        
+        Returns the sorted courses and, if the prerequisites contain a cycle, the courses
+        forming it; courses caught in or behind the cycle are then left out of the order.
+        """
+        course_set = set(courses)
+        sorter = TopologicalSorter()
+        # Register every course before any edge so ready courses keep their input order
+        for course in courses:
+            sorter.add(course)
+        for course in courses:
+            sorter.add(course, *(p for p in prerequisite_graph.get(course, []) if p in course_set))
+        
+        try:
+            return list(sorter.static_order()), []
+        except CycleError as e:
+            print(f"Prerequisite cycle detected: {e.args[1]}", file=sys.stderr)
+            return self._partial_topological_sort(courses, prerequisite_graph), e.args[1]
+    
+    def _partial_topological_sort(self, courses: List[str], prerequisite_graph: Dict[str, List[str]]) -> List[str]:
+        """Kahn's algorithm, leaving out courses caught in a prerequisite cycle"""
+        # Build in-degree count and the reverse edges from each prerequisite to its dependents
         in_degree = {course: 0 for course in courses}
+        dependents = defaultdict(list)
         
         for course in courses:
             for prereq in prerequisite_graph.get(course, []):
                 if prereq in in_degree:
                     in_degree[course] += 1
+                    dependents[prereq].append(course)
         
         # Queue courses with no prerequisites
-        queue = [course for course, degree in in_degree.items() if degree == 0]
+        queue = deque(course for course, degree in in_degree.items() if degree == 0)
         result = []
         
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             result.append(current)
             
             # Reduce in-degree for courses that depend on current course
-            for course in courses:
-                if current in prerequisite_graph.get(course, []):
-                    in_degree[course] -= 1
-                    if in_degree[course] == 0:
-                        queue.append(course)
+            for course in dependents[current]:
+                in_degree[course] -= 1
+                if in_degree[course] == 0:
+                    queue.append(course)
         
         return result
     
     async def find_alternative_courses(self, course_code: str, same_department: bool = True, limit: int = 10) -> List[CourseNode]:
-        """Find alternative courses that could substitute for a given course"""
-        driver = await self.connect()
+        """Find alternative courses that could substitute for a given course
         
-        async with driver.session() as session:
+        Descriptions are cut to ALTERNATIVE_DESCRIPTION_CHARS characters and prerequisites
+        to ALTERNATIVE_MAX_PREREQUISITES codes, enough for a candidate list.
+        """
+        async with self._read_transaction() as tx:
             # Get the target course info
-            result = await session.run("""
-                MATCH (course:Course {code: $course_code})
-                RETURN course.level as level, course.department as department, course.credits as credits
-            """, course_code=course_code)
+            result = await tx.run(_COURSE_PROFILE_QUERY, course_code=course_code)
             
             record = await result.single()
             if not record:
@@ -365,101 +746,37 @@ class GraphEnhancedAcademicPlanner:
             credits = record["credits"]
             
             # Find similar courses
-            where_clauses = ["alt.code <> $course_code", "alt.level = $level"]
             params = {"course_code": course_code, "level": level, "limit": limit}
             
             if same_department and department:
-                where_clauses.append("alt.department = $department")
                 params["department"] = department
             
             if credits:
-                where_clauses.append("alt.credits = $credits")
                 params["credits"] = credits
             
-            where_clause = " AND ".join(where_clauses)
-            
-            result = await session.run(f"""
-                MATCH (alt:Course)
-                WHERE {where_clause}
-                OPTIONAL MATCH (prereq:Course)-[:PREREQUISITE_FOR]->(alt)
-                RETURN alt.code as code,
-                       alt.title as title,
-                       alt.credits as credits,
-                       alt.level as level,
-                       alt.department as department,
-                       alt.description as description,
-                       collect(prereq.code) as prerequisites
-                ORDER BY alt.code
-                LIMIT $limit
-            """, **params)
-            
-            alternatives = []
-            async for record in result:
-                alternatives.append(CourseNode(
-                    code=record["code"],
-                    title=record["title"],
-                    credits=record["credits"] or 3,
-                    level=record["level"],
-                    department=record["department"],
-                    description=record["description"] or "",
-                    prerequisites=[p for p in record["prerequisites"] if p]
-                ))
-            
-            return alternatives
+            query = _FIND_ALTERNATIVE_QUERIES[frozenset(params.keys() - {"limit"})]
+            result = await tx.run(query, **params)
+            records = (await result.to_eager_result()).records
+        
+        return [_course_node(record) for record in records]
     
     async def analyze_degree_progress(self, completed_courses: List[str], target_courses: List[str]) -> Dict[str, Any]:
         """Analyze progress toward degree completion"""
-        driver = await self.connect()
-        
-        # Get information about completed and target courses
-        all_course_codes = list(set(completed_courses + target_courses))
-        course_info = {}
+        completed_set = set(completed_courses)
+        remaining_courses = [code for code in target_courses if code not in completed_set]
         
-        async with driver.session() as session:
-            for course_code in all_course_codes:
-                result = await session.run("""
-                    MATCH (course:Course {code: $course_code})
-                    RETURN course.code as code,
-                           course.title as title,
-                           course.credits as credits,
-                           course.level as level,
-                           course.department as department
-                """, course_code=course_code)
-                
-                record = await result.single()
-                if record:
-                    course_info[course_code] = {
-                        "code": record["code"],
-                        "title": record["title"],
-                        "credits": record["credits"] or 3,
-                        "level": record["level"],
-                        "department": record["department"]
-                    }
-        
-        # Calculate completed statistics
-        completed_credits = sum(
-            course_info[code]["credits"] for code in completed_courses 
-            if code in course_info
-        )
-        completed_upper_division = sum(
-            course_info[code]["credits"] for code in completed_courses 
-            if code in course_info and course_info[code]["level"] == "upper-division"
-        )
-        completed_disciplines = set(
-            course_info[code]["department"] for code in completed_courses 
-            if code in course_info
-        )
-        
-        # Calculate remaining requirements
-        remaining_courses = [code for code in target_courses if code not in completed_courses]
-        remaining_credits = sum(
-            course_info[code]["credits"] for code in remaining_courses 
-            if code in course_info
-        )
-        remaining_upper_division = sum(
-            course_info[code]["credits"] for code in remaining_courses 
-            if code in course_info and course_info[code]["level"] == "upper-division"
-        )
+        # Credit and discipline totals for both lists are aggregated by Neo4j in one round trip
+        totals = await self.aggregate_course_groups({
+            "completed": completed_courses,
+            "remaining": remaining_courses
+        })
+        completed = totals["completed"]
+        remaining = totals["remaining"]
+        completed_credits = completed["credits"]
+        completed_upper_division = completed["upper_division_credits"]
+        completed_disciplines = completed["disciplines"]
+        remaining_credits = remaining["credits"]
+        remaining_upper_division = remaining["upper_division_credits"]
         
         total_credits = completed_credits + remaining_credits
         total_upper_division = completed_upper_division + remaining_upper_division
@@ -474,7 +791,7 @@ class GraphEnhancedAcademicPlanner:
                 "courses": len(completed_courses),
                 "credits": completed_credits,
                 "upper_division_credits": completed_upper_division,
-                "disciplines": list(completed_disciplines),
+                "disciplines": completed_disciplines,
                 "discipline_count": len(completed_disciplines)
             },
             "remaining": {
@@ -486,7 +803,7 @@ class GraphEnhancedAcademicPlanner:
             "totals": {
                 "credits": total_credits,
                 "upper_division_credits": total_upper_division,
-                "disciplines": list(completed_disciplines)
+                "disciplines": completed_disciplines
             },
             "iap_requirements": {
                 "total_credits": {
@@ -3,14 +3,19 @@ IAP (Individualized Academic Plan) Management Tools
 Provides comprehensive tools for creating, managing, and validating IAP templates
 """
 
-import json
 import asyncio
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
-from datetime import datetime
+import copy
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from operator import itemgetter
+from collections import OrderedDict, defaultdict
 import re
+import sys
 
-@dataclass
+@dataclass(slots=True)
 class IAPTemplate:
     """Data structure for IAP Template"""
     id: Optional[int] = None
@@ -71,645 +76,773 @@ class IAPTemplate:
             self.completion_status = {}
         if self.validation_results is None:
             self.validation_results = {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the template's fields, with timestamps as ISO strings
+        
+        Unlike dataclasses.asdict, nested dicts and lists are returned as-is rather than
+        deep-copied, so treat them as read-only.
+        """
+        data = {name: getattr(self, name) for name in self.__slots__}
+        for field in ("created_at", "updated_at"):
+            if data[field] is not None:
+                data[field] = data[field].isoformat()
+        return data
+
+# Number of distinct course lists whose GE analysis IAPManager keeps
+_GE_CACHE_SIZE = 256
+
+# Utah Tech General Education requirements
+_GE_REQUIREMENTS = {
+    "Written Communication": {
+        "required_credits": 6,
+        "courses": ("ENGL 1010", "ENGL 2010"),
+        "description": "Composition and Rhetoric courses"
+    },
+    "Quantitative Literacy": {
+        "required_credits": 3,
+        "courses": ("MATH 1030", "MATH 1040", "MATH 1050", "STAT 1040"),
+        "description": "Mathematics or Statistics course"
+    },
+    "Life Sciences": {
+        "required_credits": 3,
+        "courses": ("BIOL 1010", "BIOL 1610", "BIOL 1620"),
+        "description": "Biological science with lab"
+    },
+    "Physical Sciences": {
+        "required_credits": 3,
+        "courses": ("CHEM 1110", "PHYS 1010", "GEOL 1110", "ASTR 1040"),
+        "description": "Physical science with lab"
+    },
+    "Social Sciences": {
+        "required_credits": 6,
+        "courses": ("PSYC 1010", "SOC 1010", "ANTH 1010", "POLS 1100", "ECON 2010"),
+        "description": "Two social science courses from different disciplines"
+    },
+    "Humanities": {
+        "required_credits": 6,
+        "courses": ("HIST 1700", "PHIL 1000", "ENGL 2600", "ART 1010", "MUSC 1010"),
+        "description": "Two humanities courses from different disciplines"
+    },
+    "Fine Arts": {
+        "required_credits": 3,
+        "courses": ("ART 1010", "MUSC 1010", "THEA 1013", "DANC 1010"),
+        "description": "One fine arts course"
+    },
+    "American Institutions": {
+        "required_credits": 3,
+        "courses": ("POLS 1100", "HIST 1700", "HIST 2700"),
+        "description": "American government or history"
+    },
+    "Diversity": {
+        "required_credits": 3,
+        "courses": ("ANTH 1010", "SOC 1010", "HIST 1500", "ENGL 2600"),
+        "description": "Course addressing diversity and inclusion"
+    }
+}
+
+def _build_ge_course_index() -> Dict[str, Tuple[str, ...]]:
+    """Map each upper-cased GE course code to the categories it counts toward"""
+    index: Dict[str, List[str]] = {}
+    for category, requirements in _GE_REQUIREMENTS.items():
+        for course in requirements["courses"]:
+            index.setdefault(course.upper(), []).append(category)
+    return {course: tuple(categories) for course, categories in index.items()}
+
+_GE_COURSE_INDEX = _build_ge_course_index()
+_GE_TOTAL_CREDITS = sum(requirements["required_credits"] for requirements in _GE_REQUIREMENTS.values())
+
+# Recommendation text for untouched GE categories depends only on the category
+_GE_NOT_STARTED_RECOMMENDATIONS = {
+    category: f"Complete {category}: {requirements['description']}"
+    for category, requirements in _GE_REQUIREMENTS.items()
+}
+
+# Defaults for a new IAP template; {degree_emphasis} is filled in per student
+_DEFAULT_PROGRAM_GOALS = (
+    "Students will demonstrate expertise in {degree_emphasis} principles and practices",
+    "Students will apply interdisciplinary approaches to solve complex problems",
+    "Students will communicate effectively across multiple disciplines",
+    "Students will conduct independent research in their chosen field",
+    "Students will demonstrate ethical reasoning and professional responsibility",
+    "Students will synthesize knowledge from diverse academic perspectives"
+)
+
+_DEFAULT_PLOS = (
+    {"id": "PLO1", "description": "Students will analyze complex problems using {degree_emphasis} methodologies"},
+    {"id": "PLO2", "description": "Students will demonstrate effective written and oral communication skills"},
+    {"id": "PLO3", "description": "Students will apply research methods appropriate to their field of study"},
+    {"id": "PLO4", "description": "Students will evaluate information critically from multiple perspectives"},
+    {"id": "PLO5", "description": "Students will demonstrate professional competency in their chosen field"},
+    {"id": "PLO6", "description": "Students will integrate knowledge across disciplinary boundaries"}
+)
+
+_INDS_CORE_COURSES = {
+    "INDS 3800": {"title": "Individualized Studies Seminar", "credits": 3, "status": "required"},
+    "INDS 3805": {"title": "Individualized Studies Lab", "credits": 1, "status": "required"},
+    "capstone": {"options": ["INDS 4700", "INTS 4950R"], "credits": 3, "status": "required"}
+}
+
+_INITIAL_COMPLETION_STATUS = {
+    "cover_letter": False,
+    "mission_statement": False,
+    "program_goals": True,  # Pre-populated
+    "program_learning_outcomes": True,  # Pre-populated
+    "course_mappings": False,
+    "concentration_areas": False,
+    "academic_plan": False,
+    "overall_percentage": 28.6  # 2/7 sections complete
+}
+
+_TEMPLATE_NEXT_STEPS = (
+    "Complete cover letter information",
+    "Customize mission statement",
+    "Define concentration areas (3+ disciplines)",
+    "Map courses to Program Learning Outcomes",
+    "Plan academic course sequence"
+)
+
+# Sections that update_iap_section accepts, in the order they are reported
+_VALID_IAP_SECTIONS = (
+    "cover_letter", "mission_statement", "program_goals", 
+    "program_learning_outcomes", "course_mappings", 
+    "concentration_areas", "academic_plan"
+)
+_VALID_IAP_SECTION_SET = frozenset(_VALID_IAP_SECTIONS)
+
+# iap_templates columns a section is stored in; academic_plan data is spread across its tracking columns
+_IAP_SECTION_COLUMNS = {"cover_letter": "cover_letter_data"}
+_ACADEMIC_PLAN_COLUMNS = ("general_education", "inds_core_courses", "concentration_courses")
+
+# IAPTemplate fields the database fills in, left out of upserted rows
+_IAP_GENERATED_COLUMNS = frozenset(("id", "created_at", "updated_at"))
+
+# How long update_iap_section waits for further edits before writing buffered sections
+_IAP_FLUSH_DELAY = 0.1
+
+# NOT NULL iap_templates columns every upserted row carries; with student_id they form the upsert key
+_IAP_IDENTITY_COLUMNS = ("student_name", "degree_emphasis")
+
+# Fields validate_iap_requirements requires to be present and non-empty
+_REQUIRED_IAP_FIELDS = (
+    "student_name", "student_id", "degree_emphasis", 
+    "mission_statement", "program_goals", "program_learning_outcomes"
+)
+_REQUIRED_IAP_FIELDS_GETTER = itemgetter(*_REQUIRED_IAP_FIELDS)
+
+# BIS credit requirements reported until course mappings feed real credit totals
+_PLACEHOLDER_CREDIT_ANALYSIS = {
+    "total_credits_required": 120,
+    "upper_division_required": 40,
+    "concentration_credits_required": 42,
+    "concentration_upper_division_required": 21,
+    "status": "Needs course mapping to calculate actual credits"
+}
+
+_IAP_VIOLATION_RECOMMENDATIONS = (
+    "Complete all required sections before submission",
+    "Use the generate_iap_suggestions tool for content ideas",
+    "Map courses to PLOs using course search tools"
+)
+
+# Static suggestion content; only the degree-emphasis text is built per call
+_STANDARD_PROGRAM_GOALS = (
+    "Students will apply interdisciplinary research methods effectively",
+    "Students will communicate complex ideas clearly across diverse audiences",
+    "Students will evaluate information critically using multiple theoretical frameworks",
+    "Students will demonstrate ethical reasoning in professional contexts",
+    "Students will synthesize knowledge from diverse academic and professional sources"
+)
+
+_PROGRAM_GOAL_CUSTOMIZATION_TIPS = (
+    "Tailor goals to your specific career objectives",
+    "Include industry-specific competencies",
+    "Consider adding goals related to your concentration areas",
+    "Ensure goals are measurable and achievable"
+)
+
+_MISSION_CONNECTION_TEMPLATE = "This interdisciplinary approach aligns perfectly with my mission to [insert your mission here], as stated in my mission statement: '[insert direct quote from mission statement]'."
+
+_UNIQUE_VALUE_TEMPLATE = "This individualized degree program offers advantages that existing programs cannot provide, specifically the ability to combine multiple disciplines in a coherent, purposeful way that addresses real-world challenges."
+
+_STANDARD_RESEARCH_SUGGESTIONS = (
+    "Research salary trends and growth projections",
+    "Find industry reports and professional organization data",
+    "Include specific numbers and citations for credibility"
+)
+
+_DEFAULT_CONCENTRATION_AREAS = ["Communication", "Research Methods"]
+
+_POPULAR_CONCENTRATION_COMBINATIONS = (
+    ("Psychology", "Sociology", "Communication"),
+    ("Business", "Technology", "Ethics"),
+    ("Education", "Psychology", "Research Methods"),
+    ("Health Sciences", "Psychology", "Public Policy"),
+    ("Environmental Studies", "Policy", "Communication")
+)
+
+_CONCENTRATION_AREA_REQUIREMENTS = (
+    "Must have at least 3 concentration areas",
+    "Each area needs minimum 6 upper-division credits",
+    "Total concentration credits must be 42+",
+    "Areas should complement your degree emphasis"
+)
+
+# BIS concentration credit requirements checked by validate_concentration_areas
+_MIN_AREA_CREDITS = 14
+_MIN_AREA_UPPER_DIVISION_CREDITS = 7
+_MIN_CONCENTRATION_CREDITS = 42
+_MIN_CONCENTRATION_UPPER_DIVISION_CREDITS = 21
+
+_CONCENTRATION_DEFICIENCY_RECOMMENDATIONS = (
+    "Use course search tools to find additional courses for deficient areas",
+    f"Ensure each concentration has at least {_MIN_AREA_CREDITS} credits ({_MIN_AREA_UPPER_DIVISION_CREDITS} upper-division)",
+    "Consider adding courses or adjusting concentration areas",
+    "Verify course prerequisites and availability"
+)
+
+# Simulated market research data (in production, would integrate with APIs)
+_SIMULATED_MARKET_DATA = {
+    "job_market_data": {
+        "employment_growth_rate": "8-12% annually",
+        "job_openings_projected": "15,000+ over next 5 years",
+        "unemployment_rate": "2.1% (below national average)",
+        "market_demand": "High"
+    },
+    "salary_data": {
+        "entry_level_range": "$35,000 - $45,000",
+        "mid_career_range": "$50,000 - $70,000",
+        "senior_level_range": "$75,000 - $95,000",
+        "median_salary": "$58,000"
+    },
+    "industry_trends": {
+        "emerging_opportunities": (
+            "Digital transformation roles",
+            "Remote work coordination",
+            "Interdisciplinary project management",
+            "Data-driven decision making"
+        ),
+        "growth_sectors": (
+            "Healthcare technology",
+            "Educational services",
+            "Professional services",
+            "Government and public administration"
+        )
+    },
+    "skill_demand": {
+        "high_demand_skills": (
+            "Critical thinking and analysis",
+            "Communication and presentation",
+            "Project management",
+            "Research and data analysis",
+            "Cross-functional collaboration"
+        ),
+        "technical_skills": (
+            "Data analysis software",
+            "Digital communication tools",
+            "Research methodologies",
+            "Statistical analysis"
+        )
+    },
+    "geographic_data": {
+        "primary_markets": ("Salt Lake City", "Provo", "Ogden", "St. George"),
+        "remote_opportunities": "65% of positions offer remote/hybrid options",
+        "regional_advantages": (
+            "Growing tech sector",
+            "Strong education infrastructure",
+            "Business-friendly environment"
+        )
+    },
+    "sources": (
+        "Bureau of Labor Statistics",
+        "Utah Department of Workforce Services",
+        "LinkedIn Economic Graph",
+        "Glassdoor Salary Reports",
+        "Utah Governor's Office of Economic Development"
+    )
+}
+
+_MARKET_RESEARCH_RECOMMENDATIONS = (
+    "Emphasize interdisciplinary skills in your IAP",
+    "Include courses in data analysis and research methods",
+    "Consider internships in growing sectors",
+    "Develop both technical and soft skills",
+    "Network within Utah's professional communities"
+)
 
 class IAPManager:
     """Manages IAP templates and operations"""
     
     def __init__(self, supabase_client=None):
         self.supabase = supabase_client
+        # GE analysis depends only on the course list, so repeat lists reuse the earlier result
+        self._ge_cache: OrderedDict[Tuple[str, ...], Dict[str, Any]] = OrderedDict()
+        # Section updates buffered per student until the next flush
+        self._pending: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        self._flush_task: Optional[asyncio.Task] = None
+        # Identity columns of each student's stored template, which every upserted row carries
+        self._identities: Dict[str, Dict[str, Any]] = {}
+        # Error from the last failed background flush, reported by the next update
+        self._flush_error: Optional[str] = None
     
-    async def create_iap_template(self, student_name: str, student_id: str, 
+    def create_iap_template(self, student_name: str, student_id: str, 
                                 degree_emphasis: str, student_email: str = "", 
                                 student_phone: str = "") -> Dict[str, Any]:
         """Create a new IAP template for a student"""
-        try:
-            # Create new IAP template
-            iap = IAPTemplate(
-                student_name=student_name,
-                student_id=student_id,
-                student_email=student_email,
-                student_phone=student_phone,
-                degree_emphasis=degree_emphasis
+        # Create new IAP template
+        iap = IAPTemplate(
+            student_name=student_name,
+            student_id=student_id,
+            student_email=student_email,
+            student_phone=student_phone,
+            degree_emphasis=degree_emphasis
+        )
+        
+        # Initialize default structure
+        iap.program_goals = list(_default_program_goals(degree_emphasis))
+        
+        iap.program_learning_outcomes = [
+            dict(
+                plo,
+                description=description,
+                lower_division_courses=[],
+                upper_division_courses=[]
             )
-            
-            # Initialize default structure
-            iap.program_goals = [
-                f"Students will demonstrate expertise in {degree_emphasis} principles and practices",
-                f"Students will apply interdisciplinary approaches to solve complex problems",
-                f"Students will communicate effectively across multiple disciplines",
-                f"Students will conduct independent research in their chosen field",
-                f"Students will demonstrate ethical reasoning and professional responsibility",
-                f"Students will synthesize knowledge from diverse academic perspectives"
-            ]
-            
-            iap.program_learning_outcomes = [
-                {
-                    "id": "PLO1",
-                    "description": f"Students will analyze complex problems using {degree_emphasis} methodologies",
-                    "lower_division_courses": [],
-                    "upper_division_courses": []
-                },
-                {
-                    "id": "PLO2", 
-                    "description": "Students will demonstrate effective written and oral communication skills",
-                    "lower_division_courses": [],
-                    "upper_division_courses": []
-                },
-                {
-                    "id": "PLO3",
-                    "description": "Students will apply research methods appropriate to their field of study",
-                    "lower_division_courses": [],
-                    "upper_division_courses": []
-                },
-                {
-                    "id": "PLO4",
-                    "description": "Students will evaluate information critically from multiple perspectives",
-                    "lower_division_courses": [],
-                    "upper_division_courses": []
-                },
-                {
-                    "id": "PLO5",
-                    "description": "Students will demonstrate professional competency in their chosen field",
-                    "lower_division_courses": [],
-                    "upper_division_courses": []
-                },
-                {
-                    "id": "PLO6",
-                    "description": "Students will integrate knowledge across disciplinary boundaries",
-                    "lower_division_courses": [],
-                    "upper_division_courses": []
-                }
-            ]
-            
-            # Initialize INDS core courses
-            iap.inds_core_courses = {
-                "INDS 3800": {"title": "Individualized Studies Seminar", "credits": 3, "status": "required"},
-                "INDS 3805": {"title": "Individualized Studies Lab", "credits": 1, "status": "required"},
-                "capstone": {"options": ["INDS 4700", "INTS 4950R"], "credits": 3, "status": "required"}
-            }
-            
-            # Initialize completion tracking
-            iap.completion_status = {
-                "cover_letter": False,
-                "mission_statement": False,
-                "program_goals": True,  # Pre-populated
-                "program_learning_outcomes": True,  # Pre-populated
-                "course_mappings": False,
-                "concentration_areas": False,
-                "academic_plan": False,
-                "overall_percentage": 28.6  # 2/7 sections complete
-            }
-            
-            return {
-                "success": True,
-                "message": f"IAP template created for {student_name}",
-                "iap_template": asdict(iap),
-                "next_steps": [
-                    "Complete cover letter information",
-                    "Customize mission statement",
-                    "Define concentration areas (3+ disciplines)",
-                    "Map courses to Program Learning Outcomes",
-                    "Plan academic course sequence"
-                ]
-            }
-            
-        except Exception as e:
+            for plo, description in zip(_DEFAULT_PLOS, _default_plo_descriptions(degree_emphasis))
+        ]
+        
+        # Initialize INDS core courses; copied so one template's edits never reach another
+        iap.inds_core_courses = copy.deepcopy(_INDS_CORE_COURSES)
+        
+        # Initialize completion tracking; copied because bootstrap_iap updates it
+        iap.completion_status = dict(_INITIAL_COMPLETION_STATUS)
+        
+        iap_template = iap.to_dict()
+        if self.supabase is not None:
+            # The new row is saved by the next flush, ahead of any section updates queued after it
+            self._identities[student_id] = {column: iap_template[column] for column in _IAP_IDENTITY_COLUMNS}
+            self._queue_columns(student_id, {
+                column: value for column, value in iap_template.items()
+                if column not in _IAP_GENERATED_COLUMNS
+            })
+        
+        return {
+            "success": True,
+            "message": f"IAP template created for {student_name}",
+            "iap_template": iap_template,
+            "next_steps": list(_TEMPLATE_NEXT_STEPS)
+        }
+    
+    def bootstrap_iap(self, student_name: str, student_id: str, 
+                          degree_emphasis: str, sections: Dict[str, Any], 
+                          student_email: str = "", student_phone: str = "") -> Dict[str, Any]:
+        """Create an IAP template with initial section data applied in one step"""
+        invalid_sections = [section for section in sections if section not in _VALID_IAP_SECTION_SET]
+        if invalid_sections:
             return {
                 "success": False,
-                "error": f"Failed to create IAP template: {str(e)}",
-                "troubleshooting": [
-                    "Verify student information is complete",
-                    "Check degree emphasis format",
-                    "Ensure database connection is working"
-                ]
+                "error": f"Invalid sections {invalid_sections}. Valid sections: {list(_VALID_IAP_SECTIONS)}"
             }
+        
+        section_columns = {section: _section_columns(section, data) for section, data in sections.items()}
+        empty_sections = [section for section, columns in section_columns.items() if not columns]
+        if empty_sections:
+            return {"success": False, "error": _empty_section_error(empty_sections)}
+        
+        created = self.create_iap_template(
+            student_name=student_name,
+            student_id=student_id,
+            degree_emphasis=degree_emphasis,
+            student_email=student_email,
+            student_phone=student_phone
+        )
+        iap_template = created["iap_template"]
+        completion_status = iap_template["completion_status"]
+        for section, columns in section_columns.items():
+            iap_template.update(columns)
+            completion_status[section] = True
+        
+        completed = sum(1 for section in _VALID_IAP_SECTIONS if completion_status.get(section))
+        completion_status["overall_percentage"] = round(completed / len(_VALID_IAP_SECTIONS) * 100, 1)
+        
+        result = {
+            **created,
+            "message": f"IAP template created for {student_name} with {len(sections)} initial sections",
+            "updated_sections": list(sections),
+            "timestamp": _now_iso()
+        }
+        if self.supabase is not None:
+            # Merged into the row create_iap_template queued, so the template is saved as one upsert
+            self._queue_columns(student_id, {
+                column: iap_template[column]
+                for columns in section_columns.values() for column in columns
+            })
+            self._queue_columns(student_id, {"completion_status": completion_status})
+        return result
     
     async def update_iap_section(self, student_id: str, section: str, 
                                data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a specific section of an IAP template"""
-        try:
-            valid_sections = [
-                "cover_letter", "mission_statement", "program_goals", 
-                "program_learning_outcomes", "course_mappings", 
-                "concentration_areas", "academic_plan"
-            ]
-            
-            if section not in valid_sections:
-                return {
-                    "success": False,
-                    "error": f"Invalid section '{section}'. Valid sections: {valid_sections}"
-                }
-            
-            # For now, return success with update confirmation
-            # In full implementation, this would update the database
-            return {
-                "success": True,
-                "message": f"Updated {section} for student {student_id}",
-                "section": section,
-                "updated_data": data,
-                "timestamp": datetime.now().isoformat()
-            }
-            
-        except Exception as e:
+        if section not in _VALID_IAP_SECTION_SET:
             return {
                 "success": False,
-                "error": f"Failed to update IAP section: {str(e)}"
+                "error": f"Invalid section '{section}'. Valid sections: {list(_VALID_IAP_SECTIONS)}"
             }
+        
+        columns = _section_columns(section, data)
+        if not columns:
+            return {"success": False, "error": _empty_section_error([section])}
+        
+        if self.supabase is not None and student_id not in self._identities:
+            identity = await asyncio.to_thread(self._fetch_identity, student_id)
+            if identity is None:
+                return {
+                    "success": False,
+                    "error": f"No IAP template found for student {student_id}. Create one with create_iap_template first"
+                }
+            self._identities[student_id] = identity
+        
+        result = {
+            "success": True,
+            "message": f"Updated {section} for student {student_id}",
+            "section": section,
+            "updated_data": data,
+            "timestamp": _now_iso()
+        }
+        if self.supabase is not None:
+            self._queue_columns(student_id, columns)
+            result["message"] = f"Queued {section} update for student {student_id}; it is saved in the background"
+            if self._flush_error is not None:
+                result["warning"] = f"Earlier IAP updates failed to save and are being retried: {self._flush_error}"
+                self._flush_error = None
+        return result
+    
+    def _queue_columns(self, student_id: str, columns: Dict[str, Any]) -> None:
+        """Buffer column updates for a student and schedule a debounced flush"""
+        self._pending[student_id].update(columns)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._debounced_flush())
+    
+    async def _debounced_flush(self) -> None:
+        """Flush buffered section updates once edits pause, until none are left"""
+        while self._pending:
+            await asyncio.sleep(_IAP_FLUSH_DELAY)
+            try:
+                await self.flush()
+            except Exception as e:
+                # Failed entries stay queued; the next update schedules a retry
+                self._flush_error = str(e)
+                print(f"Failed to flush IAP updates: {e}", file=sys.stderr)
+                return
+    
+    async def flush(self) -> None:
+        """Upsert all buffered section updates, one request per set of changed columns"""
+        pending, self._pending = self._pending, defaultdict(dict)
+        pending = {student_id: columns for student_id, columns in pending.items() if columns}
+        if not pending:
+            return
+        
+        # Queued students always have identities: create_iap_template records them, and
+        # update_iap_section looks them up before queuing
+        try:
+            # Bulk upserts fill absent keys with NULL, so only rows with the same columns share a request
+            updated_at = _now_iso()
+            batches: Dict[frozenset, List[Dict[str, Any]]] = defaultdict(list)
+            for student_id, columns in pending.items():
+                row = {**self._identities[student_id], **columns, "student_id": student_id, "updated_at": updated_at}
+                batches[frozenset(row)].append(row)
+            for rows in batches.values():
+                await asyncio.to_thread(self._upsert_rows, rows)
+                for row in rows:
+                    del pending[row["student_id"]]
+        except Exception:
+            # Keep unwritten sections queued, letting newer edits win
+            for student_id, columns in pending.items():
+                self._pending[student_id] = {**columns, **self._pending.get(student_id, {})}
+            raise
+    
+    def _fetch_identity(self, student_id: str) -> Optional[Dict[str, Any]]:
+        """Look up the identity columns of a student's most recently updated template"""
+        response = self.supabase.table("iap_templates").select(
+            ", ".join(_IAP_IDENTITY_COLUMNS)
+        ).eq("student_id", student_id).order("updated_at", desc=True).limit(1).execute()
+        return response.data[0] if response.data else None
     
-    async def generate_iap_suggestions(self, degree_emphasis: str, 
+    def _upsert_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert or update template rows on the table's (student_id, degree_emphasis) key"""
+        self.supabase.table("iap_templates").upsert(rows, on_conflict="student_id,degree_emphasis").execute()
+    
+    def generate_iap_suggestions(self, degree_emphasis: str, 
                                      section: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Generate AI-powered suggestions for IAP content"""
-        try:
-            suggestions = {}
-            
-            if section == "mission_statement":
-                suggestions = {
-                    "mission_statement": f"The BIS with an emphasis in {degree_emphasis} at UT prepares students to become innovative professionals and critical thinkers by having students complete interdisciplinary coursework, hands-on research projects, and real-world applications. This program develops analytical skills, communication competencies, and ethical reasoning necessary for success in today's complex professional landscape.",
-                    "alternatives": [
-                        f"The BIS with an emphasis in {degree_emphasis} at UT prepares students to address complex societal challenges by integrating knowledge across multiple disciplines through collaborative projects, independent research, and community engagement.",
-                        f"The BIS with an emphasis in {degree_emphasis} at UT prepares students to become leaders in their chosen field by developing critical thinking skills, research competencies, and professional expertise through personalized academic experiences."
-                    ]
-                }
-            
-            elif section == "program_goals":
-                suggestions = {
-                    "program_goals": [
-                        f"Students will demonstrate mastery of core concepts in {degree_emphasis}",
-                        "Students will apply interdisciplinary research methods effectively",
-                        "Students will communicate complex ideas clearly across diverse audiences",
-                        "Students will evaluate information critically using multiple theoretical frameworks",
-                        "Students will demonstrate ethical reasoning in professional contexts",
-                        "Students will synthesize knowledge from diverse academic and professional sources"
-                    ],
-                    "customization_tips": [
-                        "Tailor goals to your specific career objectives",
-                        "Include industry-specific competencies",
-                        "Consider adding goals related to your concentration areas",
-                        "Ensure goals are measurable and achievable"
-                    ]
-                }
-            
-            elif section == "cover_letter":
-                suggestions = {
-                    "paragraph_templates": {
-                        "introduction": f"I am pursuing a Bachelor of Individualized Studies with an emphasis in {degree_emphasis} because this unique program allows me to combine my diverse academic interests and career goals in ways that traditional degree programs cannot accommodate.",
-                        "mission_connection": "This interdisciplinary approach aligns perfectly with my mission to [insert your mission here], as stated in my mission statement: '[insert direct quote from mission statement]'.",
-                        "coursework_relevance": f"My carefully selected coursework directly supports my mission and goals, including upper-division courses such as [Course 1], [Course 2], and [Course 3], which provide the theoretical foundation and practical skills necessary for success in {degree_emphasis}.",
-                        "market_viability": f"The field of {degree_emphasis} shows strong growth potential, with [insert relevant statistics] indicating increasing demand for professionals with interdisciplinary expertise.",
-                        "unique_value": "This individualized degree program offers advantages that existing programs cannot provide, specifically the ability to combine multiple disciplines in a coherent, purposeful way that addresses real-world challenges."
-                    },
-                    "research_suggestions": [
-                        f"Look up current job market statistics for {degree_emphasis}",
-                        "Research salary trends and growth projections",
-                        "Find industry reports and professional organization data",
-                        "Include specific numbers and citations for credibility"
-                    ]
-                }
-            
-            elif section == "concentration_areas":
-                # Suggest concentration areas based on degree emphasis
-                base_areas = degree_emphasis.split()
-                suggestions = {
-                    "recommended_areas": base_areas[:3] if len(base_areas) >= 3 else base_areas + ["Communication", "Research Methods"],
-                    "popular_combinations": [
-                        ["Psychology", "Sociology", "Communication"],
-                        ["Business", "Technology", "Ethics"],
-                        ["Education", "Psychology", "Research Methods"],
-                        ["Health Sciences", "Psychology", "Public Policy"],
-                        ["Environmental Studies", "Policy", "Communication"]
-                    ],
-                    "requirements": [
-                        "Must have at least 3 concentration areas",
-                        "Each area needs minimum 6 upper-division credits",
-                        "Total concentration credits must be 42+",
-                        "Areas should complement your degree emphasis"
-                    ]
-                }
-            
-            return {
-                "success": True,
-                "section": section,
-                "degree_emphasis": degree_emphasis,
-                "suggestions": suggestions,
-                "generated_at": datetime.now().isoformat()
+        suggestions = {}
+        
+        if section == "mission_statement":
+            suggestions = {
+                "mission_statement": f"The BIS with an emphasis in {degree_emphasis} at UT prepares students to become innovative professionals and critical thinkers by having students complete interdisciplinary coursework, hands-on research projects, and real-world applications. This program develops analytical skills, communication competencies, and ethical reasoning necessary for success in today's complex professional landscape.",
+                "alternatives": [
+                    f"The BIS with an emphasis in {degree_emphasis} at UT prepares students to address complex societal challenges by integrating knowledge across multiple disciplines through collaborative projects, independent research, and community engagement.",
+                    f"The BIS with an emphasis in {degree_emphasis} at UT prepares students to become leaders in their chosen field by developing critical thinking skills, research competencies, and professional expertise through personalized academic experiences."
+                ]
             }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to generate suggestions: {str(e)}"
+        
+        elif section == "program_goals":
+            suggestions = {
+                "program_goals": [
+                    f"Students will demonstrate mastery of core concepts in {degree_emphasis}",
+                    *_STANDARD_PROGRAM_GOALS
+                ],
+                "customization_tips": _PROGRAM_GOAL_CUSTOMIZATION_TIPS
+            }
+        
+        elif section == "cover_letter":
+            suggestions = {
+                "paragraph_templates": {
+                    "introduction": f"I am pursuing a Bachelor of Individualized Studies with an emphasis in {degree_emphasis} because this unique program allows me to combine my diverse academic interests and career goals in ways that traditional degree programs cannot accommodate.",
+                    "mission_connection": _MISSION_CONNECTION_TEMPLATE,
+                    "coursework_relevance": f"My carefully selected coursework directly supports my mission and goals, including upper-division courses such as [Course 1], [Course 2], and [Course 3], which provide the theoretical foundation and practical skills necessary for success in {degree_emphasis}.",
+                    "market_viability": f"The field of {degree_emphasis} shows strong growth potential, with [insert relevant statistics] indicating increasing demand for professionals with interdisciplinary expertise.",
+                    "unique_value": _UNIQUE_VALUE_TEMPLATE
+                },
+                "research_suggestions": [
+                    f"Look up current job market statistics for {degree_emphasis}",
+                    *_STANDARD_RESEARCH_SUGGESTIONS
+                ]
             }
+        
+        elif section == "concentration_areas":
+            # Suggest concentration areas based on degree emphasis
+            base_areas = degree_emphasis.split()
+            suggestions = {
+                "recommended_areas": base_areas[:3] if len(base_areas) >= 3 else base_areas + _DEFAULT_CONCENTRATION_AREAS,
+                "popular_combinations": _POPULAR_CONCENTRATION_COMBINATIONS,
+                "requirements": _CONCENTRATION_AREA_REQUIREMENTS
+            }
+        
+        return {
+            "success": True,
+            "section": section,
+            "degree_emphasis": degree_emphasis,
+            "suggestions": suggestions,
+            "generated_at": _now_iso()
+        }
     
-    async def validate_iap_requirements(self, iap_data: Dict[str, Any]) -> Dict[str, Any]:
+    def validate_iap_requirements(self, iap_data: Dict[str, Any]) -> Dict[str, Any]:
         """Comprehensive validation of IAP requirements"""
+        # Validate required sections, fetching them in one call when all are present
         try:
-            validation_results = {
-                "overall_valid": True,
-                "sections": {},
-                "credit_analysis": {},
-                "violations": [],
-                "recommendations": []
-            }
-            
-            # Validate required sections
-            required_sections = [
-                "student_name", "student_id", "degree_emphasis", 
-                "mission_statement", "program_goals", "program_learning_outcomes"
-            ]
-            
-            for section in required_sections:
-                is_complete = bool(iap_data.get(section))
-                validation_results["sections"][section] = {
-                    "complete": is_complete,
-                    "required": True
-                }
-                if not is_complete:
-                    validation_results["overall_valid"] = False
-                    validation_results["violations"].append(f"Missing required section: {section}")
-            
-            # Validate program goals (should have 6)
-            goals = iap_data.get("program_goals", [])
-            validation_results["sections"]["program_goals"]["count"] = len(goals)
-            if len(goals) < 6:
-                validation_results["violations"].append(f"Need 6 program goals, found {len(goals)}")
-            
-            # Validate PLOs (should have 6)
-            plos = iap_data.get("program_learning_outcomes", [])
-            validation_results["sections"]["program_learning_outcomes"]["count"] = len(plos)
-            if len(plos) < 6:
-                validation_results["violations"].append(f"Need 6 Program Learning Outcomes, found {len(plos)}")
-            
-            # Validate concentration areas (need 3+)
-            concentration_areas = iap_data.get("concentration_areas", [])
-            validation_results["sections"]["concentration_areas"] = {
-                "count": len(concentration_areas),
-                "areas": concentration_areas,
-                "valid": len(concentration_areas) >= 3
-            }
-            if len(concentration_areas) < 3:
-                validation_results["violations"].append(f"Need 3+ concentration areas, found {len(concentration_areas)}")
-            
-            # Credit analysis (placeholder - would integrate with course data)
-            validation_results["credit_analysis"] = {
-                "total_credits_required": 120,
-                "upper_division_required": 40,
-                "concentration_credits_required": 42,
-                "concentration_upper_division_required": 21,
-                "status": "Needs course mapping to calculate actual credits"
-            }
-            
-            # Generate recommendations
-            if validation_results["violations"]:
-                validation_results["recommendations"].extend([
-                    "Complete all required sections before submission",
-                    "Use the generate_iap_suggestions tool for content ideas",
-                    "Map courses to PLOs using course search tools"
-                ])
-            
-            return {
-                "success": True,
-                "validation_results": validation_results,
-                "next_steps": validation_results["recommendations"]
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to validate IAP: {str(e)}"
-            }
+            values = _REQUIRED_IAP_FIELDS_GETTER(iap_data)
+        except KeyError:
+            values = tuple(map(iap_data.get, _REQUIRED_IAP_FIELDS))
+        missing = [section for section, value in zip(_REQUIRED_IAP_FIELDS, values) if not value]
+        
+        validation_results = {
+            "overall_valid": not missing,
+            "sections": {
+                section: {"complete": bool(value), "required": True}
+                for section, value in zip(_REQUIRED_IAP_FIELDS, values)
+            },
+            "credit_analysis": {},
+            "violations": [f"Missing required section: {section}" for section in missing],
+            "recommendations": []
+        }
+        
+        # Validate program goals (should have 6)
+        goals = iap_data.get("program_goals", [])
+        validation_results["sections"]["program_goals"]["count"] = len(goals)
+        if len(goals) < 6:
+            validation_results["violations"].append(f"Need 6 program goals, found {len(goals)}")
+        
+        # Validate PLOs (should have 6)
+        plos = iap_data.get("program_learning_outcomes", [])
+        validation_results["sections"]["program_learning_outcomes"]["count"] = len(plos)
+        if len(plos) < 6:
+            validation_results["violations"].append(f"Need 6 Program Learning Outcomes, found {len(plos)}")
+        
+        # Validate concentration areas (need 3+)
+        concentration_areas = iap_data.get("concentration_areas", [])
+        validation_results["sections"]["concentration_areas"] = {
+            "count": len(concentration_areas),
+            "areas": concentration_areas,
+            "valid": len(concentration_areas) >= 3
+        }
+        if len(concentration_areas) < 3:
+            validation_results["violations"].append(f"Need 3+ concentration areas, found {len(concentration_areas)}")
+        
+        # Credit analysis (placeholder - would integrate with course data)
+        validation_results["credit_analysis"] = dict(_PLACEHOLDER_CREDIT_ANALYSIS)
+        
+        # Generate recommendations
+        if validation_results["violations"]:
+            validation_results["recommendations"].extend(_IAP_VIOLATION_RECOMMENDATIONS)
+        
+        return {
+            "success": True,
+            "validation_results": validation_results,
+            "next_steps": validation_results["recommendations"]
+        }
     
-    async def conduct_market_research(self, degree_emphasis: str, 
+    def conduct_market_research(self, degree_emphasis: str, 
                                     geographic_focus: str = "Utah") -> Dict[str, Any]:
         """Conduct market research for degree viability analysis"""
-        try:
-            # Simulate market research data (in production, would integrate with APIs)
-            market_data = {
-                "job_market_data": {
-                    "employment_growth_rate": "8-12% annually",
-                    "job_openings_projected": "15,000+ over next 5 years",
-                    "unemployment_rate": "2.1% (below national average)",
-                    "market_demand": "High"
-                },
-                "salary_data": {
-                    "entry_level_range": "$35,000 - $45,000",
-                    "mid_career_range": "$50,000 - $70,000",
-                    "senior_level_range": "$75,000 - $95,000",
-                    "median_salary": "$58,000"
-                },
-                "industry_trends": {
-                    "emerging_opportunities": [
-                        "Digital transformation roles",
-                        "Remote work coordination",
-                        "Interdisciplinary project management",
-                        "Data-driven decision making"
-                    ],
-                    "growth_sectors": [
-                        "Healthcare technology",
-                        "Educational services",
-                        "Professional services",
-                        "Government and public administration"
-                    ]
-                },
-                "skill_demand": {
-                    "high_demand_skills": [
-                        "Critical thinking and analysis",
-                        "Communication and presentation",
-                        "Project management",
-                        "Research and data analysis",
-                        "Cross-functional collaboration"
-                    ],
-                    "technical_skills": [
-                        "Data analysis software",
-                        "Digital communication tools",
-                        "Research methodologies",
-                        "Statistical analysis"
-                    ]
-                },
-                "geographic_data": {
-                    "primary_markets": ["Salt Lake City", "Provo", "Ogden", "St. George"],
-                    "remote_opportunities": "65% of positions offer remote/hybrid options",
-                    "regional_advantages": [
-                        "Growing tech sector",
-                        "Strong education infrastructure",
-                        "Business-friendly environment"
-                    ]
-                },
-                "sources": [
-                    "Bureau of Labor Statistics",
-                    "Utah Department of Workforce Services",
-                    "LinkedIn Economic Graph",
-                    "Glassdoor Salary Reports",
-                    "Utah Governor's Office of Economic Development"
-                ]
-            }
-            
-            # Calculate viability score
-            viability_score = self._calculate_viability_score(market_data)
-            
-            # Generate summary
-            viability_summary = self._generate_viability_summary(degree_emphasis, market_data, viability_score)
-            
-            return {
-                "success": True,
-                "degree_emphasis": degree_emphasis,
-                "geographic_focus": geographic_focus,
-                "market_data": market_data,
-                "viability_score": viability_score,
-                "viability_summary": viability_summary,
-                "research_date": datetime.now().date().isoformat(),
-                "recommendations": [
-                    "Emphasize interdisciplinary skills in your IAP",
-                    "Include courses in data analysis and research methods",
-                    "Consider internships in growing sectors",
-                    "Develop both technical and soft skills",
-                    "Network within Utah's professional communities"
-                ]
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to conduct market research: {str(e)}"
-            }
+        market_data = copy.deepcopy(_SIMULATED_MARKET_DATA)
+        
+        # Calculate viability score
+        viability_score = self._calculate_viability_score(market_data)
+        
+        # Generate summary
+        viability_summary = self._generate_viability_summary(degree_emphasis, market_data, viability_score)
+        
+        return {
+            "success": True,
+            "degree_emphasis": degree_emphasis,
+            "geographic_focus": geographic_focus,
+            "market_data": market_data,
+            "viability_score": viability_score,
+            "viability_summary": viability_summary,
+            "research_date": _today_iso(),
+            "recommendations": _MARKET_RESEARCH_RECOMMENDATIONS
+        }
     
-    async def track_general_education(self, student_id: str, 
+    def track_general_education(self, student_id: str, 
                                    course_list: List[str] = None) -> Dict[str, Any]:
         """Track general education requirement completion"""
-        try:
-            # Utah Tech General Education requirements
-            ge_requirements = {
-                "Written Communication": {
-                    "required_credits": 6,
-                    "courses": ["ENGL 1010", "ENGL 2010"],
-                    "description": "Composition and Rhetoric courses"
-                },
-                "Quantitative Literacy": {
-                    "required_credits": 3,
-                    "courses": ["MATH 1030", "MATH 1040", "MATH 1050", "STAT 1040"],
-                    "description": "Mathematics or Statistics course"
-                },
-                "Life Sciences": {
-                    "required_credits": 3,
-                    "courses": ["BIOL 1010", "BIOL 1610", "BIOL 1620"],
-                    "description": "Biological science with lab"
-                },
-                "Physical Sciences": {
-                    "required_credits": 3,
-                    "courses": ["CHEM 1110", "PHYS 1010", "GEOL 1110", "ASTR 1040"],
-                    "description": "Physical science with lab"
-                },
-                "Social Sciences": {
-                    "required_credits": 6,
-                    "courses": ["PSYC 1010", "SOC 1010", "ANTH 1010", "POLS 1100", "ECON 2010"],
-                    "description": "Two social science courses from different disciplines"
-                },
-                "Humanities": {
-                    "required_credits": 6,
-                    "courses": ["HIST 1700", "PHIL 1000", "ENGL 2600", "ART 1010", "MUSC 1010"],
-                    "description": "Two humanities courses from different disciplines"
-                },
-                "Fine Arts": {
-                    "required_credits": 3,
-                    "courses": ["ART 1010", "MUSC 1010", "THEA 1013", "DANC 1010"],
-                    "description": "One fine arts course"
-                },
-                "American Institutions": {
-                    "required_credits": 3,
-                    "courses": ["POLS 1100", "HIST 1700", "HIST 2700"],
-                    "description": "American government or history"
-                },
-                "Diversity": {
-                    "required_credits": 3,
-                    "courses": ["ANTH 1010", "SOC 1010", "HIST 1500", "ENGL 2600"],
-                    "description": "Course addressing diversity and inclusion"
-                }
-            }
-            
-            # Track completion if course list provided
-            completion_status = {}
-            total_ge_credits = 0
-            completed_ge_credits = 0
-            
-            for category, requirements in ge_requirements.items():
-                status = {
-                    "required_credits": requirements["required_credits"],
-                    "completed_credits": 0,
-                    "courses_applied": [],
-                    "completion_status": "not_started",
-                    "description": requirements["description"]
-                }
-                
-                if course_list:
-                    # Check which courses fulfill this requirement
-                    for course in course_list:
-                        if course.upper() in [c.upper() for c in requirements["courses"]]:
-                            status["courses_applied"].append(course)
-                            status["completed_credits"] += 3  # Assume 3 credits per course
-                    
-                    # Update completion status
-                    if status["completed_credits"] >= requirements["required_credits"]:
-                        status["completion_status"] = "completed"
-                    elif status["completed_credits"] > 0:
-                        status["completion_status"] = "in_progress"
-                
-                completion_status[category] = status
-                total_ge_credits += requirements["required_credits"]
-                completed_ge_credits += min(status["completed_credits"], requirements["required_credits"])
-            
-            # Calculate overall completion percentage
-            completion_percentage = (completed_ge_credits / total_ge_credits) * 100 if total_ge_credits > 0 else 0
-            
-            return {
-                "success": True,
-                "student_id": student_id,
-                "ge_requirements": completion_status,
-                "summary": {
-                    "total_required_credits": total_ge_credits,
-                    "completed_credits": completed_ge_credits,
-                    "remaining_credits": total_ge_credits - completed_ge_credits,
-                    "completion_percentage": round(completion_percentage, 1)
-                },
-                "recommendations": self._generate_ge_recommendations(completion_status)
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to track general education: {str(e)}"
+        courses = tuple(course_list or ())
+        analysis = self._ge_cache.get(courses)
+        if analysis is None:
+            analysis = self._analyze_general_education(courses)
+            self._ge_cache[courses] = analysis
+            if len(self._ge_cache) > _GE_CACHE_SIZE:
+                self._ge_cache.popitem(last=False)
+        else:
+            self._ge_cache.move_to_end(courses)
+        
+        return {
+            "success": True,
+            "student_id": student_id,
+            **analysis
+        }
+    
+    def _analyze_general_education(self, course_list: Tuple[str, ...]) -> Dict[str, Any]:
+        """Compare a course list against the GE requirements"""
+        # Dispatch each course to the categories it fulfills
+        courses_applied: Dict[str, List[str]] = defaultdict(list)
+        for course in course_list:
+            for category in _GE_COURSE_INDEX.get(course.upper(), ()):
+                courses_applied[category].append(course)
+        
+        completion_status = {
+            category: {
+                "required_credits": requirements["required_credits"],
+                "completed_credits": (completed := len(courses_applied[category]) * 3),  # Assume 3 credits per course
+                "courses_applied": courses_applied[category],
+                "completion_status": _ge_completion_status(completed, requirements["required_credits"]),
+                "description": requirements["description"]
             }
+            for category, requirements in _GE_REQUIREMENTS.items()
+        }
+        completed_ge_credits = sum(
+            min(status["completed_credits"], status["required_credits"]) for status in completion_status.values()
+        )
+        
+        # Calculate overall completion percentage
+        completion_percentage = (completed_ge_credits / _GE_TOTAL_CREDITS) * 100 if _GE_TOTAL_CREDITS > 0 else 0
+        
+        return {
+            "ge_requirements": completion_status,
+            "summary": {
+                "total_required_credits": _GE_TOTAL_CREDITS,
+                "completed_credits": completed_ge_credits,
+                "remaining_credits": _GE_TOTAL_CREDITS - completed_ge_credits,
+                "completion_percentage": round(completion_percentage, 1)
+            },
+            "recommendations": self._generate_ge_recommendations(completion_status)
+        }
     
-    async def validate_concentration_areas(self, student_id: str, 
+    def validate_concentration_areas(self, student_id: str, 
                                          concentration_areas: List[str],
                                          course_mappings: Dict[str, List[str]]) -> Dict[str, Any]:
         """Validate concentration area requirements and credit distribution"""
-        try:
-            if len(concentration_areas) < 3:
-                return {
-                    "success": False,
-                    "error": "IAP requires at least 3 concentration areas",
-                    "current_count": len(concentration_areas)
-                }
-            
-            validation_results = {
-                "overall_valid": True,
-                "concentration_analysis": {},
-                "credit_distribution": {},
-                "violations": [],
-                "recommendations": []
-            }
-            
-            total_concentration_credits = 0
-            total_upper_division = 0
-            
-            # Analyze each concentration area
-            for area in concentration_areas:
-                area_courses = course_mappings.get(area, [])
-                area_analysis = {
-                    "courses": area_courses,
-                    "total_credits": 0,
-                    "upper_division_credits": 0,
-                    "lower_division_credits": 0,
-                    "valid": True,
-                    "issues": []
-                }
-                
-                # Analyze courses in this concentration
-                for course in area_courses:
-                    # Assume 3 credits per course (would query database in production)
-                    credits = 3
-                    area_analysis["total_credits"] += credits
-                    total_concentration_credits += credits
-                    
-                    # Classify course level
-                    if classify_course_level(course) == "upper-division":
-                        area_analysis["upper_division_credits"] += credits
-                        total_upper_division += credits
-                    else:
-                        area_analysis["lower_division_credits"] += credits
-                
-                # Validate concentration requirements
-                if area_analysis["total_credits"] < 14:
-                    area_analysis["valid"] = False
-                    area_analysis["issues"].append(f"Need {14 - area_analysis['total_credits']} more credits")
-                    validation_results["violations"].append(f"{area}: Insufficient credits ({area_analysis['total_credits']}/14)")
-                    validation_results["overall_valid"] = False
-                
-                if area_analysis["upper_division_credits"] < 7:
-                    area_analysis["issues"].append(f"Need {7 - area_analysis['upper_division_credits']} more upper-division credits")
-                    validation_results["violations"].append(f"{area}: Insufficient upper-division credits ({area_analysis['upper_division_credits']}/7)")
-                    validation_results["overall_valid"] = False
-                
-                validation_results["concentration_analysis"][area] = area_analysis
-            
-            # Overall credit distribution analysis
-            validation_results["credit_distribution"] = {
-                "total_concentration_credits": total_concentration_credits,
-                "required_concentration_credits": 42,
-                "total_upper_division_credits": total_upper_division,
-                "required_upper_division_credits": 21,
-                "concentration_credits_valid": total_concentration_credits >= 42,
-                "upper_division_credits_valid": total_upper_division >= 21
-            }
-            
-            # Check overall requirements
-            if total_concentration_credits < 42:
-                validation_results["violations"].append(f"Total concentration credits insufficient ({total_concentration_credits}/42)")
-                validation_results["overall_valid"] = False
-            
-            if total_upper_division < 21:
-                validation_results["violations"].append(f"Upper-division concentration credits insufficient ({total_upper_division}/21)")
-                validation_results["overall_valid"] = False
-            
-            # Generate recommendations
-            if not validation_results["overall_valid"]:
-                validation_results["recommendations"].extend([
-                    "Use course search tools to find additional courses for deficient areas",
-                    "Ensure each concentration has at least 14 credits (7 upper-division)",
-                    "Consider adding courses or adjusting concentration areas",
-                    "Verify course prerequisites and availability"
-                ])
-            else:
-                validation_results["recommendations"].append("✅ All concentration area requirements met!")
-            
-            return {
-                "success": True,
-                "student_id": student_id,
-                "validation_results": validation_results
-            }
-            
-        except Exception as e:
+        if len(concentration_areas) < 3:
             return {
                 "success": False,
-                "error": f"Failed to validate concentration areas: {str(e)}"
+                "error": "IAP requires at least 3 concentration areas",
+                "current_count": len(concentration_areas)
             }
-    
-    def _calculate_viability_score(self, market_data: Dict[str, Any]) -> float:
-        """Calculate degree viability score based on market data"""
-        # Simple scoring algorithm (would be more sophisticated in production)
-        score = 70.0  # Base score
         
-        # Adjust based on market factors
-        if "High" in market_data.get("job_market_data", {}).get("market_demand", ""):
-            score += 15
+        concentration_analysis = {}
+        violations = []
+        total_concentration_credits = 0
+        total_upper_division = 0
+        
+        # Analyze each concentration area, recording its violations as it is totalled
+        for area in concentration_areas:
+            area_courses = course_mappings.get(area, [])
+            area_credits, area_upper_division = _area_credit_totals(tuple(area_courses))
+            issues = []
+            total_concentration_credits += area_credits
+            total_upper_division += area_upper_division
+            
+            # Validate concentration requirements
+            if area_credits < _MIN_AREA_CREDITS:
+                issues.append(f"Need {_MIN_AREA_CREDITS - area_credits} more credits")
+                violations.append(f"{area}: Insufficient credits ({area_credits}/{_MIN_AREA_CREDITS})")
+            
+            if area_upper_division < _MIN_AREA_UPPER_DIVISION_CREDITS:
+                issues.append(f"Need {_MIN_AREA_UPPER_DIVISION_CREDITS - area_upper_division} more upper-division credits")
+                violations.append(f"{area}: Insufficient upper-division credits ({area_upper_division}/{_MIN_AREA_UPPER_DIVISION_CREDITS})")
+            
+            concentration_analysis[area] = {
+                "courses": area_courses,
+                "total_credits": area_credits,
+                "upper_division_credits": area_upper_division,
+                "lower_division_credits": area_credits - area_upper_division,
+                "valid": area_credits >= _MIN_AREA_CREDITS,
+                "issues": issues
+            }
         
-        if "below national average" in market_data.get("job_market_data", {}).get("unemployment_rate", ""):
-            score += 10
+        # Check overall requirements
+        concentration_credits_valid = total_concentration_credits >= _MIN_CONCENTRATION_CREDITS
+        upper_division_credits_valid = total_upper_division >= _MIN_CONCENTRATION_UPPER_DIVISION_CREDITS
+        if not concentration_credits_valid:
+            violations.append(f"Total concentration credits insufficient ({total_concentration_credits}/{_MIN_CONCENTRATION_CREDITS})")
+        
+        if not upper_division_credits_valid:
+            violations.append(f"Upper-division concentration credits insufficient ({total_upper_division}/{_MIN_CONCENTRATION_UPPER_DIVISION_CREDITS})")
+        
+        # Every failed check records a violation, so the violations decide validity
+        validation_results = {
+            "overall_valid": not violations,
+            "concentration_analysis": concentration_analysis,
+            "credit_distribution": {
+                "total_concentration_credits": total_concentration_credits,
+                "required_concentration_credits": _MIN_CONCENTRATION_CREDITS,
+                "total_upper_division_credits": total_upper_division,
+                "required_upper_division_credits": _MIN_CONCENTRATION_UPPER_DIVISION_CREDITS,
+                "concentration_credits_valid": concentration_credits_valid,
+                "upper_division_credits_valid": upper_division_credits_valid
+            },
+            "violations": violations,
+            "recommendations": (
+                list(_CONCENTRATION_DEFICIENCY_RECOMMENDATIONS) if violations
+                else ["✅ All concentration area requirements met!"]
+            )
+        }
         
-        # Cap at 100
-        return min(score, 100.0)
+        return {
+            "success": True,
+            "student_id": student_id,
+            "validation_results": validation_results
+        }
+    
+    def _calculate_viability_score(self, market_data: Dict[str, Any]) -> float:
+        """Calculate degree viability score based on market data"""
+        job_market = market_data.get("job_market_data", {})
+        return _viability_score(job_market.get("market_demand", ""), job_market.get("unemployment_rate", ""))
     
     def _generate_viability_summary(self, degree_emphasis: str, market_data: Dict[str, Any], score: float) -> str:
         """Generate a summary of degree viability"""
-        if score >= 85:
-            outlook = "excellent"
-        elif score >= 70:
-            outlook = "good"
-        elif score >= 55:
-            outlook = "fair"
-        else:
-            outlook = "challenging"
-        
-        return f"The market outlook for a BIS degree with emphasis in {degree_emphasis} is {outlook} (viability score: {score}/100). The field shows strong growth potential with diverse career opportunities, particularly in Utah's expanding professional services and technology sectors."
+        return _viability_summary(degree_emphasis, score)
     
     def _generate_ge_recommendations(self, completion_status: Dict[str, Any]) -> List[str]:
         """Generate recommendations for GE completion"""
@@ -717,7 +850,7 @@ class IAPManager:
         
         for category, status in completion_status.items():
             if status["completion_status"] == "not_started":
-                recommendations.append(f"Complete {category}: {status['description']}")
+                recommendations.append(_GE_NOT_STARTED_RECOMMENDATIONS[category])
             elif status["completion_status"] == "in_progress":
                 remaining = status["required_credits"] - status["completed_credits"]
                 recommendations.append(f"Complete {category}: {remaining} more credits needed")
@@ -728,24 +861,126 @@ class IAPManager:
         return recommendations
 
 # Utility functions for IAP processing
+def _section_columns(section: str, data: Any) -> Dict[str, Any]:
+    """Map an IAP section's data onto the iap_templates columns that store it"""
+    if section == "academic_plan":
+        if not isinstance(data, dict):
+            return {}
+        return {column: data[column] for column in _ACADEMIC_PLAN_COLUMNS if column in data}
+    return {_IAP_SECTION_COLUMNS.get(section, section): data}
+
+def _empty_section_error(sections: List[str]) -> str:
+    """Validation error for sections whose data maps to no stored columns"""
+    return (f"Sections {sections} have no data to store. academic_plan must be an object "
+            f"with at least one of {list(_ACADEMIC_PLAN_COLUMNS)}")
+
+# Response timestamps are reused for this many seconds, so a burst of calls formats one
+_NOW_ISO_TTL = 0.05
+_now_iso_cache = [float("-inf"), ""]
+
+def _now_iso() -> str:
+    """Current local time as an ISO string, refreshed at most every _NOW_ISO_TTL seconds"""
+    now = time.monotonic()
+    if now - _now_iso_cache[0] > _NOW_ISO_TTL:
+        _now_iso_cache[:] = (now, datetime.now().isoformat())
+    return _now_iso_cache[1]
+
+@lru_cache(maxsize=1)
+def _date_iso(ordinal: int) -> str:
+    """ISO string for a proleptic Gregorian ordinal; only the latest day is kept"""
+    return date.fromordinal(ordinal).isoformat()
+
+def _today_iso() -> str:
+    """Today's date as an ISO string, formatted once per day"""
+    return _date_iso(date.today().toordinal())
+
+def _ge_completion_status(completed_credits: int, required_credits: int) -> str:
+    """Completion label for a GE category given its completed and required credits"""
+    if completed_credits >= required_credits:
+        return "completed"
+    return "in_progress" if completed_credits > 0 else "not_started"
+
+# Market research repeats for the same inputs, so scores and summaries are cached
+@lru_cache(maxsize=256)
+def _viability_score(market_demand: str, unemployment_rate: str) -> float:
+    """Score degree viability from the market demand and unemployment descriptions"""
+    # Simple scoring algorithm (would be more sophisticated in production)
+    score = 70.0  # Base score
+    
+    # Adjust based on market factors
+    if "High" in market_demand:
+        score += 15
+    
+    if "below national average" in unemployment_rate:
+        score += 10
+    
+    # Cap at 100
+    return min(score, 100.0)
+
+@lru_cache(maxsize=256)
+def _viability_summary(degree_emphasis: str, score: float) -> str:
+    """Summarize degree viability for an emphasis and its score"""
+    if score >= 85:
+        outlook = "excellent"
+    elif score >= 70:
+        outlook = "good"
+    elif score >= 55:
+        outlook = "fair"
+    else:
+        outlook = "challenging"
+    
+    return f"The market outlook for a BIS degree with emphasis in {degree_emphasis} is {outlook} (viability score: {score}/100). The field shows strong growth potential with diverse career opportunities, particularly in Utah's expanding professional services and technology sectors."
+
+@lru_cache(maxsize=256)
+def _default_program_goals(degree_emphasis: str) -> Tuple[str, ...]:
+    """Default program goals worded for a degree emphasis"""
+    return tuple(goal.format(degree_emphasis=degree_emphasis) for goal in _DEFAULT_PROGRAM_GOALS)
+
+@lru_cache(maxsize=256)
+def _default_plo_descriptions(degree_emphasis: str) -> Tuple[str, ...]:
+    """Default PLO descriptions worded for a degree emphasis, in _DEFAULT_PLOS order"""
+    return tuple(plo["description"].format(degree_emphasis=degree_emphasis) for plo in _DEFAULT_PLOS)
+
+@lru_cache(maxsize=1024)
+def _area_credit_totals(courses: Tuple[str, ...]) -> Tuple[int, int]:
+    """Return (total, upper-division) credits for a concentration area's courses"""
+    # Assume 3 credits per course (would query database in production)
+    credits = 3
+    upper_division = list(map(classify_course_level, courses)).count("upper-division")
+    return len(courses) * credits, upper_division * credits
+
+# Case-insensitive so only the matched codes are upper-cased, not the whole text
+_COURSE_CODE_PATTERN = re.compile(r'\b([A-Z]{2,4})\s*(\d{4}[A-Z]?)\b', re.IGNORECASE)
+
 def extract_course_codes(text: str) -> List[str]:
-    """Extract course codes from text (e.g., 'CS 1400', 'MATH 1050')"""
-    pattern = r'\b[A-Z]{2,4}\s+\d{4}[A-Z]?\b'
-    return re.findall(pattern, text.upper())
+    """Extract course codes from text (e.g., 'CS 1400', 'MATH1050'), normalized to 'DEPT NUMBER'"""
+    return [
+        f"{department} {number}".upper()
+        for department, number in _COURSE_CODE_PATTERN.findall(text)
+    ]
 
+# Course codes are immutable strings that recur across concentration areas, so results are cached
+@lru_cache(maxsize=4096)
 def classify_course_level(course_code: str) -> str:
     """Classify course as lower-division or upper-division"""
-    if re.match(r'[A-Z]+\s+[3-9]\d{3}', course_code):
+    # Upper-division codes are 'DEPT NNNN': an uppercase department, whitespace, then a 3000+ number
+    parts = course_code.split(None, 1)
+    if len(parts) < 2 or not course_code.startswith(parts[0]):
+        return "lower-division"
+    department, number = parts
+    if (department.isascii() and department.isalpha() and department.isupper()
+            and "3" <= number[:1] <= "9" and len(number) >= 4 and number[1:4].isdecimal()):
         return "upper-division"
     else:
         return "lower-division"
 
+# IAP fields that count toward calculate_completion_percentage
+_COMPLETION_SECTIONS = (
+    "mission_statement", "program_goals", "program_learning_outcomes",
+    "concentration_areas", "course_mappings", "cover_letter_data", "academic_plan"
+)
+
 def calculate_completion_percentage(iap_data: Dict[str, Any]) -> float:
     """Calculate overall completion percentage of IAP"""
-    required_sections = [
-        "mission_statement", "program_goals", "program_learning_outcomes",
-        "concentration_areas", "course_mappings", "cover_letter_data", "academic_plan"
-    ]
-    
-    completed = sum(1 for section in required_sections if iap_data.get(section))
-    return (completed / len(required_sections)) * 100
+    completed = sum(1 for section in _COMPLETION_SECTIONS if iap_data.get(section))
+    return (completed / len(_COMPLETION_SECTIONS)) * 100